@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+HTML parser backend benchmark
+Checks that every parser backend, in full and targeted mode, produces identical
+records on a corpus of Scholar pages and reports how many rows/pages per second
+each one parses and its peak memory per detail page.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from parser import PARSER_BACKENDS, ProcessParsePool, get_parser_backend
+from scholar_fixtures import (render_detail_page, render_list_page, render_search_page,
+                              synthetic_papers)
+
+BASE_URL = "https://scholar.google.com"
+
+
+def classify_page(content):
+    """Guess which Scholar endpoint a saved page came from"""
+    if b'gsc_oci_table' in content:
+        return 'detail'
+    if b'gsc_a_tr' in content:
+        return 'list'
+    if b'gs_rt2' in content:
+        return 'search'
+    return None
+
+
+def load_corpus(corpus_dir):
+    """Read saved .html pages from a directory, grouped by page kind"""
+    corpus = {'search': [], 'list': [], 'detail': []}
+    for path in sorted(Path(corpus_dir).rglob('*.html')):
+        content = path.read_bytes()
+        kind = classify_page(content)
+        if kind:
+            corpus[kind].append((path.name, content))
+    return corpus
+
+
+def synthetic_corpus(list_pages, detail_pages):
+    """Render a corpus of synthetic pages"""
+    user_id = 'SYNTHAAAAJ'
+    papers = synthetic_papers(user_id, max(list_pages * 100, detail_pages))
+    corpus = {
+        'search': [('search.html', render_search_page('Synthetic Author', [
+            {'user_id': user_id, 'name': 'Synthetic Author', 'affiliation': 'Example University', 'cited_by': 1234},
+            {'user_id': 'OTHERAAAAJ', 'name': 'Synthetic Author Jr', 'affiliation': 'Elsewhere', 'cited_by': 12},
+        ]).encode())],
+        'list': [],
+        'detail': [],
+    }
+    for page in range(list_pages):
+        rows = papers[page * 100:(page + 1) * 100]
+        corpus['list'].append((f'list_{page}.html', render_list_page(rows, user_id).encode()))
+    for paper in papers[:detail_pages]:
+        corpus['detail'].append((f"detail_{paper['citation_id']}.html", render_detail_page(paper, user_id).encode()))
+    return corpus
+
+
+def parse_corpus(backend, corpus):
+    """Parse every page in the corpus with one backend"""
+    return {
+        'search': [backend.parse_profile_search(content, BASE_URL) for _, content in corpus['search']],
+        'list': [backend.parse_profile_page(content, BASE_URL) for _, content in corpus['list']],
+        'detail': [backend.parse_paper_details(content) for _, content in corpus['detail']],
+    }
+
+
+def compare_records(corpus, results):
+    """Report every page on which a backend disagrees with the first one"""
+    names = list(results)
+    reference = names[0]
+    mismatches = 0
+    for kind in ('search', 'list', 'detail'):
+        for i, (page_name, _) in enumerate(corpus[kind]):
+            for name in names[1:]:
+                if results[name][kind][i] != results[reference][kind][i]:
+                    mismatches += 1
+                    print(f"MISMATCH {kind} page {page_name}: {name} differs from {reference}")
+    return mismatches
+
+
+def benchmark(backend, corpus, repeat):
+    """Time each page kind separately and return rows or pages per second"""
+    rates = {}
+    for kind, parse in (('list', backend.parse_profile_page),
+                        ('detail', lambda content, base_url: backend.parse_paper_details(content))):
+        pages = corpus[kind]
+        if not pages:
+            continue
+        started = time.perf_counter()
+        items = 0
+        for _ in range(repeat):
+            for _, content in pages:
+                parsed = parse(content, BASE_URL)
+                items += len(parsed) if kind == 'list' else 1
+        rates[kind] = items / (time.perf_counter() - started)
+    return rates
+
+
+def process_pool_rate(backend, corpus, repeat, processes):
+    """Detail pages per second when parsing is spread over a pool of worker processes"""
+    pool = ProcessParsePool(processes, backend.name, backend.targeted)
+    try:
+        # Start every worker before timing
+        warmup = [pool.submit('parse_paper_details', corpus['detail'][0][1]) for _ in range(processes)]
+        for future in warmup:
+            future.result()
+        started = time.perf_counter()
+        futures = [pool.submit('parse_paper_details', content) for _ in range(repeat) for _, content in corpus['detail']]
+        for future in futures:
+            future.result()
+        return len(futures) / (time.perf_counter() - started)
+    finally:
+        pool.close()
+
+
+def peak_detail_memory(backend, corpus):
+    """Largest peak allocation, in KiB, while parsing a single detail page"""
+    peak = 0
+    for _, content in corpus['detail'][:50]:
+        tracemalloc.start()
+        backend.parse_paper_details(content)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends for correctness and speed')
+    parser.add_argument('--corpus', help='Directory of saved Scholar pages (*.html); synthetic pages are used if omitted')
+    parser.add_argument('--list-pages', type=int, default=5, help='Synthetic list pages to render (100 rows each)')
+    parser.add_argument('--detail-pages', type=int, default=200, help='Synthetic detail pages to render')
+    parser.add_argument('--repeat', type=int, default=3, help='Times to parse the corpus per backend')
+    parser.add_argument('--backends', nargs='+', default=list(PARSER_BACKENDS), help='Backends to compare')
+    parser.add_argument('--processes', type=int, default=0, help='Also time detail parsing spread over this many worker processes')
+    parser.add_argument('--modes', nargs='+', choices=['full', 'targeted'], default=['full', 'targeted'], help='Parse modes to compare')
+
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.list_pages, args.detail_pages)
+    print(f"Corpus: {len(corpus['search'])} search, {len(corpus['list'])} list and {len(corpus['detail'])} detail pages")
+
+    backends = {}
+    for name in args.backends:
+        for mode in args.modes:
+            try:
+                backends[f"{name}/{mode}"] = get_parser_backend(name, targeted=mode == 'targeted')
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+                break
+
+    results = {name: parse_corpus(backend, corpus) for name, backend in backends.items()}
+    mismatches = compare_records(corpus, results) if len(results) > 1 else 0
+    print(f"Record check: {'identical' if not mismatches else f'{mismatches} mismatching pages'}")
+
+    pool_column = f"{args.processes} procs pages/s" if args.processes else ''
+    print(f"\n{'backend':<14} {'list rows/s':>12} {'detail pages/s':>15} {'detail peak KiB':>16} {pool_column:>18}")
+    for name, backend in backends.items():
+        rates = benchmark(backend, corpus, args.repeat)
+        peak = peak_detail_memory(backend, corpus) if corpus['detail'] else 0
+        pool_rate = f"{process_pool_rate(backend, corpus, args.repeat, args.processes):.0f}" if args.processes and corpus['detail'] else ''
+        print(f"{name:<14} {rates.get('list', 0):>12.0f} {rates.get('detail', 0):>15.0f} {peak:>16.0f} {pool_rate:>18}")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
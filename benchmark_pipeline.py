@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark
+Runs analyze_author_research against a local mock Scholar server at several
+worker counts and reports papers per second, request latency percentiles and
+peak memory, so every performance change can be measured the same way.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from mock_scholar import LATENCY_DISTRIBUTIONS, MockScholarServer
+from parser import AsyncScholarProfileParser, RateLimiter, ScholarProfileParser
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_once(server_url, author, max_papers, num_workers, engine, rate_limit):
+    """Analyze one author against the mock server and return the measurements"""
+    latencies = []
+    rate_limiter = RateLimiter(rate_limit)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        if engine == 'async':
+            import asyncio
+
+            async def run():
+                async with AsyncScholarProfileParser(max_connections=num_workers, rate_limiter=rate_limiter) as scholar:
+                    scholar.base_url = server_url
+                    # One attempt per sample, like transport.get below, so both engines time the same thing
+                    get = scholar.get
+
+                    async def timed_get(url, params=None):
+                        sent = time.perf_counter()
+                        try:
+                            return await get(url, params)
+                        finally:
+                            latencies.append(time.perf_counter() - sent)
+
+                    scholar.get = timed_get
+                    return await scholar.analyze_author_research(author, max_papers, num_workers=num_workers)
+
+            papers = asyncio.run(run())
+        else:
+            scholar = ScholarProfileParser(pool_size=num_workers, rate_limiter=rate_limiter)
+            scholar.base_url = server_url
+            get = scholar.transport.get
+
+            def timed_get(url, **kwargs):
+                sent = time.perf_counter()
+                try:
+                    return get(url, **kwargs)
+                finally:
+                    latencies.append(time.perf_counter() - sent)
+
+            scholar.transport.get = timed_get
+            papers = scholar.analyze_author_research(author, max_papers, num_workers=num_workers)
+            scholar.close()
+        elapsed = time.perf_counter() - started
+
+    return {
+        'num_workers': num_workers,
+        'papers': len(papers),
+        'seconds': elapsed,
+        'papers_per_second': len(papers) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'requests': len(latencies),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure pipeline throughput against a local mock Scholar server')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16, 32], help='num_workers values to compare')
+    parser.add_argument('--max-papers', type=int, default=200, help='Papers to analyze per run')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Client-side requests per second, 0 for unlimited')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean server latency in seconds')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests the server fails with HTTP 500')
+    parser.add_argument('--max-concurrent', type=int, default=0, help='Server answers 429 beyond this many requests in flight')
+    parser.add_argument('--server-rate-limit', type=float, default=0.0, help='Server answers 429 beyond this many requests per second')
+    parser.add_argument('--json', action='store_true', help='Print one JSON object per run instead of a table')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--server-url', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.single is not None:
+        # Child run: one worker count in a fresh process so peak RSS is its own
+        print(json.dumps(run_once(args.server_url, 'Benchmark Author', args.max_papers, args.single,
+                                  args.engine, args.rate_limit)))
+        return
+
+    server = MockScholarServer(papers_per_author=args.max_papers, latency=args.latency,
+                               latency_distribution=args.latency_distribution, error_rate=args.error_rate,
+                               max_concurrent=args.max_concurrent, rate_limit=args.server_rate_limit).start()
+    try:
+        if not args.json:
+            print(f"Mock server at {server.url}: {args.max_papers} papers, {args.latency * 1000:.0f} ms mean "
+                  f"{args.latency_distribution} latency, engine {args.engine}")
+            print(f"\n{'workers':>7} {'papers':>7} {'seconds':>8} {'papers/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+                  f"{'peak RSS MB':>12} {'429s':>6} {'500s':>6}")
+        for num_workers in args.workers:
+            before = server.stats()
+            command = [sys.executable, __file__, '--single', str(num_workers), '--server-url', server.url,
+                       '--max-papers', str(args.max_papers), '--engine', args.engine,
+                       '--rate-limit', str(args.rate_limit)]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            after = server.stats()
+            result['throttled'] = after['throttled'] - before['throttled']
+            result['errors'] = after['errors'] - before['errors']
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(f"{num_workers:>7} {result['papers']:>7} {result['seconds']:>8.2f} {result['papers_per_second']:>9.1f} "
+                      f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['peak_rss_mb']:>12.1f} "
+                      f"{result['throttled']:>6} {result['errors']:>6}")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
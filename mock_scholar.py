@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Mock Google Scholar server
+Serves the author search, publication list and paper detail endpoints parser.py
+uses, with synthetic authors from scholar_fixtures and configurable latency,
+errors and 429 throttling, for load and scaling benchmarks without the real site.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from scholar_fixtures import (render_detail_page, render_list_page, render_search_page,
+                              synthetic_papers)
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+
+def author_user_id(name):
+    """Stable synthetic user id for an author name"""
+    return 'M' + hashlib.sha1(name.strip().lower().encode()).hexdigest()[:10].upper() + 'AAAJ'
+
+
+class MockScholarServer:
+    """Threaded HTTP server emulating Scholar for any author name
+
+    Every searched name gets one profile with papers_per_author synthetic
+    papers. Each request waits for a latency drawn from the chosen
+    distribution, fails with a 500 at error_rate, and gets a 429 with
+    Retry-After when more than max_concurrent requests are in flight or the
+    server-side rate_limit (requests per second) is exceeded.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, papers_per_author=200, latency=0.05,
+                 latency_distribution='lognormal', error_rate=0.0, max_concurrent=0, rate_limit=0.0, seed=0):
+        self.papers_per_author = papers_per_author
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.max_concurrent = max_concurrent
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.window_started = time.monotonic()
+        self.window_requests = 0
+        self.counts = {'search': 0, 'list_works': 0, 'view_citation': 0, 'errors': 0, 'throttled': 0, 'not_found': 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    @lru_cache(maxsize=1024)
+    def papers(self, user_id):
+        return synthetic_papers(user_id, self.papers_per_author)
+
+    def draw_latency(self):
+        """Seconds to hold one response, with self.latency as the mean"""
+        if self.latency <= 0:
+            return 0.0
+        with self.lock:
+            if self.latency_distribution == 'uniform':
+                return self.random.uniform(0, 2 * self.latency)
+            if self.latency_distribution == 'exponential':
+                return self.random.expovariate(1 / self.latency)
+            if self.latency_distribution == 'lognormal':
+                # sigma 0.75 gives a long right tail; mu keeps the mean at self.latency
+                return self.random.lognormvariate(math.log(self.latency) - 0.75 ** 2 / 2, 0.75)
+            return self.latency
+
+    def should_fail(self):
+        """Draw whether this request is answered with a 500"""
+        with self.lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def admit(self):
+        """Return a Retry-After value in seconds if the request must be throttled, else None"""
+        with self.lock:
+            if self.max_concurrent and self.in_flight >= self.max_concurrent:
+                return 1
+            if self.rate_limit:
+                now = time.monotonic()
+                if now - self.window_started >= 1.0:
+                    self.window_started = now
+                    self.window_requests = 0
+                if self.window_requests >= self.rate_limit:
+                    return max(1, round(1.0 - (now - self.window_started)))
+                self.window_requests += 1
+            self.in_flight += 1
+            return None
+
+    def respond(self, path, query):
+        """Status code and body for one request"""
+        param = lambda name, default='': query.get(name, [default])[0]
+        if path == '/scholar':
+            name = param('q')
+            user_id = author_user_id(name)
+            with self.lock:
+                self.counts['search'] += 1
+            profile = {'user_id': user_id, 'name': name, 'affiliation': 'Mock University', 'cited_by': 1000}
+            return 200, render_search_page(name, [profile])
+        if path == '/citations':
+            user_id = param('user')
+            view_op = param('view_op', 'list_works')
+            if view_op == 'view_citation':
+                paper_id = param('citation_for_view')
+                papers = self.papers(paper_id.split(':')[0])
+                try:
+                    paper = papers[int(paper_id.rsplit(':P', 1)[1])]
+                except (IndexError, ValueError):
+                    return 404, ''
+                with self.lock:
+                    self.counts['view_citation'] += 1
+                return 200, render_detail_page(paper, paper_id.split(':')[0])
+            if user_id:
+                start = int(param('cstart', '0') or 0)
+                size = int(param('pagesize', '20') or 20)
+                with self.lock:
+                    self.counts['list_works'] += 1
+                return 200, render_list_page(self.papers(user_id)[start:start + size], user_id)
+        return 404, ''
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def send_body(self, status, body, headers=()):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == '/stats':
+                    return self.send_body(200, json.dumps(server.stats()))
+                retry_after = server.admit()
+                if retry_after is not None:
+                    with server.lock:
+                        server.counts['throttled'] += 1
+                    return self.send_body(429, '', [('Retry-After', str(retry_after))])
+                try:
+                    time.sleep(server.draw_latency())
+                    if server.should_fail():
+                        with server.lock:
+                            server.counts['errors'] += 1
+                        return self.send_body(500, 'Internal error')
+                    status, body = server.respond(parsed.path, parse_qs(parsed.query))
+                    if status == 404:
+                        with server.lock:
+                            server.counts['not_found'] += 1
+                    self.send_body(status, body)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic Google Scholar pages for benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--papers', type=int, default=200, help='Papers per synthetic author')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean response latency in seconds')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+    parser.add_argument('--max-concurrent', type=int, default=0, help='Answer 429 beyond this many requests in flight, 0 for no limit')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Answer 429 beyond this many requests per second, 0 for no limit')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+
+    server = MockScholarServer(args.host, args.port, args.papers, args.latency, args.latency_distribution,
+                               args.error_rate, args.max_concurrent, args.rate_limit, args.seed)
+    print(f"Mock Scholar serving on {server.url} (stats at {server.url}/stats)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats()))
+
+if __name__ == "__main__":
+    main()
@@ -6,353 +6,3711 @@ about all their publications including abstracts when available.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 import time
 import json
 import argparse
-from urllib.parse import urljoin, urlparse, parse_qs
-from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, parse_qs, parse_qsl, urlencode
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import wait as wait_futures
 import threading
+import asyncio
+import os
+import sys
+import sqlite3
+import gzip
+import hashlib
+import datetime
+import email.utils
+import random
+from array import array
+import io
+import logging
+import logging.handlers
+import queue
+from collections import deque
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-class ScholarProfileParser:
+try:
+    import lxml.html as lxml_html  # Optional, fast HTML parser backend
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_html = lxml_etree = None
+
+try:
+    import aiohttp  # Optional, only needed for AsyncScholarProfileParser
+except ImportError:
+    aiohttp = None
+
+try:
+    import zstandard  # Optional, only needed for .zst output files
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa  # Optional, only needed for Parquet and Arrow output files
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+DEFAULT_MAX_WORKERS = 32  # Ceiling for adaptive concurrency
+DEFAULT_AUTHOR_WORKERS = 4  # Authors searched and paged at once in batch mode
+DEFAULT_RATE_LIMIT = 5.0  # Requests per second across all workers
+DEFAULT_BURST = 5
+
+# Responses that mean Scholar wants us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+BLOCK_PAGE_MARKERS = (b'unusual traffic', b'gs_captcha', b'g-recaptcha', b'id="captcha')
+
+# Seconds to wait for a connection and then for each read of the response;
+# without them one hung connection can stall a worker forever
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+
+# Retries allowed per request before it is given up and dead-lettered; a lost
+# list page cuts the rest of the profile off, so list pages get the most
+DEFAULT_RETRY_BUDGETS = {'search': 3, 'list_works': 5, 'view_citation': 3, 'other': 2}
+DEFAULT_RETRY_BASE_DELAY = 1.0  # Seconds; the n-th retry waits up to base * 2**n
+DEFAULT_RETRY_MAX_DELAY = 60.0
+# Failure classes worth retrying, see classify_failure
+RETRYABLE_FAILURES = ('throttled', 'transient')
+
+DEFAULT_CACHE_PATH = '~/.cache/scholar-parser/responses.sqlite3'
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_CACHE_TTLS = {
+    'search': 7 * 24 * 3600,
+    'list_works': 6 * 3600,  # Sorted by pubdate, so new papers show up at the head
+    'list_works_other': 24 * 3600,
+    'view_citation': 30 * 24 * 3600,
+    'other': 24 * 3600,
+}
+
+# Histogram bucket upper bounds for request phases, response sizes and parse times
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+DEFAULT_METRICS_INTERVAL = 10.0  # Seconds between --metrics-json dumps
+REQUEST_PHASES = ('rate_limit_wait', 'dns', 'connect', 'ttfb', 'download', 'total')
+# Endpoint whose pages each parser backend method reads
+PARSE_METHOD_ENDPOINTS = {
+    'parse_profile_search': 'search',
+    'parse_profile_page': 'list_works',
+    'parse_paper_details': 'view_citation',
+}
+
+LIST_PAGE_SIZE = 100  # Most rows Scholar returns on one publications list page
+
+# --output files with these extensions are streamed one record per line
+JSONL_SUFFIXES = ('.jsonl', '.jsonl.gz', '.jsonl.zst')
+DEFAULT_FSYNC_EVERY = 50  # Records between fsyncs of a streamed output file
+# --output files with these extensions are written as typed columnar tables
+ARROW_SUFFIXES = ('.parquet', '.arrow', '.feather')
+DEFAULT_ROW_GROUP_SIZE = 1000
+DEFAULT_STORE_BATCH = 100  # Papers buffered before the store commits them in one transaction
+
+# Paper keys that have their own typed column; every other detail field is
+# kept as a string in the 'extra' column
+TYPED_PAPER_KEYS = ('title', 'detail_url', 'authors', 'venue', 'citations', 'year', 'Authors', 'Publication date',
+                    'Journal', 'Volume', 'Issue', 'Pages', 'Publisher', 'Description', 'abstract', 'citation_years',
+                    'citation_counts')
+
+# Fields read from the publications list; if any differ from the stored record
+# during an incremental sync, the paper's details are fetched again
+LIST_FIELDS = ('title', 'authors', 'venue', 'citations', 'year')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+LOG_LEVELS = ('debug', 'info', 'warning', 'error')
+
+log = logging.getLogger('scholar_parser')
+
+
+def log_event(level, event, message, **fields):
+    """Log a progress message as a named event; fields become keys of its JSON form"""
+    if log.isEnabledFor(level):
+        log.log(level, message, extra={'event': event, 'fields': fields})
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Render each record as one JSON object with its time, level, event name, message and fields"""
+
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'event': getattr(record, 'event', record.funcName),
+            'message': record.getMessage().strip(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=json_default)
+
+
+def setup_logging(level='info', json_format=False, stream=None):
+    """Route the parser's log records through a queue to one writer thread
+
+    Workers only enqueue records, so at high concurrency they never wait on
+    console I/O or on each other. Records go to stream (default stderr) as
+    plain text or, with json_format, one JSON object per line. Returns the
+    QueueListener; call stop() on it to flush what is still queued.
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonLogFormatter() if json_format else logging.Formatter('%(message)s'))
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler)
+    log.handlers[:] = [logging.handlers.QueueHandler(records)]
+    log.setLevel(level.upper() if isinstance(level, str) else level)
+    log.propagate = False
+    listener.start()
+    return listener
+
+
+class RateLimiter:
+    """Token bucket shared by every request path, usable from threads and coroutines
+
+    Callers reserve a token under a short lock and then wait outside of it, so
+    the bucket itself never holds up other workers while one is sleeping.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=DEFAULT_BURST):
+        self.rate = rate  # Sustained requests per second, 0 disables limiting
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Take one token and return how many seconds the caller must wait before using it"""
+        if not self.rate:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a queue of reservations ahead of this caller
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+    
+    def release(self):
+        """Hand back a reserved token that will not be used"""
+        if self.rate:
+            with self.lock:
+                self.tokens = min(self.burst, self.tokens + 1)
+    
+    def reserve_before(self, deadline):
+        """Reserve a token, raising DeadlineExceeded instead if its wait would run past the deadline"""
+        delay = self.reserve()
+        if deadline is not None and delay > 0 and delay >= deadline.remaining():
+            self.release()
+            raise DeadlineExceeded(f"Run deadline passes before a request may be sent ({delay:.1f}s rate-limit wait)")
+        return delay
+    
+    def acquire(self, deadline=None):
+        """Block the calling thread until a request may be sent"""
+        delay = self.reserve_before(deadline)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self, deadline=None):
+        """Suspend the calling coroutine until a request may be sent"""
+        delay = self.reserve_before(deadline)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ScholarBlockedError(Exception):
+    """Raised when Scholar answers with throttling or a CAPTCHA page instead of content"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status  # HTTP status of the blocking response
+        self.retry_after = retry_after  # Seconds asked for by its Retry-After header, if any
+
+
+def detect_block(status_code, url, content):
+    """Return why a response looks like throttling, or None for a normal page"""
+    if status_code in THROTTLE_STATUS_CODES:
+        return f"HTTP {status_code}"
+    if '/sorry/' in str(url):
+        return "redirected to CAPTCHA"
+    head = content[:20000].lower() if content else b''
+    for marker in BLOCK_PAGE_MARKERS:
+        if marker in head:
+            return f"block page ({marker.decode()})"
+    return None
+
+
+class DeadlineExceeded(Exception):
+    """Raised for a request the run deadline stopped before it was sent or before it finished"""
+
+
+class Deadline:
+    """Point in time by which a run has to return, with whatever it has finished by then"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self):
+        """Seconds left, never negative"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+    
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+    
+    def cap(self, seconds):
+        """A timeout of at most seconds that also ends at the deadline"""
+        return min(seconds, self.remaining()) if seconds is not None else self.remaining()
+
+
+def parse_duration(text):
+    """Seconds in a duration such as '90', '90s', '10m' or '1.5h'"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*', text)
+    if not match:
+        raise ValueError(f"invalid duration {text!r}, expected e.g. 90s, 10m or 1h")
+    return float(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max((when - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+def failure_status(error):
+    """HTTP status and headers of the response behind a failed request, or (None, None)"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code, error.response.headers
+    if aiohttp is not None and isinstance(error, aiohttp.ClientResponseError):
+        return error.status, error.headers
+    return None, None
+
+
+def classify_failure(error):
+    """Sort a failed request into 'throttled', 'blocked', 'transient', 'deadline' or 'permanent'
+
+    Throttling (HTTP 429/503) and transient faults (connection resets,
+    timeouts, other 5xx answers) are worth retrying. A CAPTCHA page does not
+    clear up within a retry budget, and a 404 or other 4xx answer never will.
+    """
+    if isinstance(error, ScholarBlockedError):
+        return 'throttled' if error.status in THROTTLE_STATUS_CODES else 'blocked'
+    if isinstance(error, DeadlineExceeded):
+        return 'deadline'
+    status, _ = failure_status(error)
+    if status is not None:
+        return 'transient' if status >= 500 else 'permanent'
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                          ConnectionError, TimeoutError)):
+        return 'transient'
+    if aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return 'transient'
+    return 'permanent'
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter under per-endpoint retry budgets
+
+    Retry n of a request waits a random time between 0 and base_delay * 2**n,
+    capped at max_delay, so workers that failed together do not come back
+    together. A Retry-After header is honoured instead when the response has
+    one. Only throttled and transient failures are retried.
+    """
+
+    def __init__(self, budgets=None, base_delay=DEFAULT_RETRY_BASE_DELAY, max_delay=DEFAULT_RETRY_MAX_DELAY, seed=None):
+        self.budgets = dict(DEFAULT_RETRY_BUDGETS, **(budgets or {}))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+    
+    def budget(self, endpoint):
+        """Retries allowed for one request to an endpoint"""
+        return self.budgets.get(endpoint, self.budgets['other'])
+    
+    def next_delay(self, endpoint, attempt, error):
+        """Seconds to wait before retrying after the attempt-th retry failed with error, or None to give up"""
+        if attempt >= self.budget(endpoint) or classify_failure(error) not in RETRYABLE_FAILURES:
+            return None
+        if isinstance(error, ScholarBlockedError):
+            retry_after = error.retry_after
+        else:
+            _, headers = failure_status(error)
+            retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        with self.lock:
+            return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class DeadLetters:
+    """Requests that still failed after their retries, kept so they can be retried at the end of a run
+
+    Each letter records the endpoint, URL, error and its failure class; a
+    failed detail page also keeps the Paper and position it belongs to.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.letters = []
+    
+    def __len__(self):
+        with self.lock:
+            return len(self.letters)
+    
+    def add(self, endpoint, url, error, params=None, paper=None, index=None):
+        letter = {
+            'endpoint': endpoint,
+            'url': url,
+            'params': params,
+            'failure': classify_failure(error),
+            'error': str(error),
+            'time': time.time(),
+            'paper': paper,
+            'index': index,
+        }
+        with self.lock:
+            self.letters.append(letter)
+    
+    def holds(self, paper):
+        """Whether the paper's details are waiting in a dead letter"""
+        with self.lock:
+            return any(letter['paper'] is paper for letter in self.letters)
+    
+    def take_papers(self):
+        """Remove and return the letters of papers whose detail fetch may succeed on another try"""
+        taken, kept = [], []
+        with self.lock:
+            for letter in self.letters:
+                retryable = letter['paper'] is not None and letter['failure'] != 'permanent'
+                (taken if retryable else kept).append(letter)
+            self.letters = kept
+        return taken
+    
+    def records(self):
+        """The letters as JSON-compatible dicts, naming the paper by title"""
+        with self.lock:
+            letters = list(self.letters)
+        records = []
+        for letter in letters:
+            record = {key: value for key, value in letter.items() if key != 'paper'}
+            if letter['paper'] is not None:
+                record['title'] = letter['paper'].get('title')
+            records.append(record)
+        return records
+    
+    def write(self, path):
+        """Write the letters to a JSON Lines file"""
+        with open(path, 'w') as f:
+            for record in self.records():
+                f.write(json.dumps(record, default=json_default) + '\n')
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of in-flight detail fetches
+
+    The window grows by roughly one slot per window's worth of fast, successful
+    requests and is cut multiplicatively on HTTP 429/503 or a CAPTCHA page.
+    Threads gate on acquire()/release(), coroutines on acquire_async()/release().
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, latency_target=3.0, backoff=0.5):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.window = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target  # Seconds; slower responses stop growth
+        self.backoff = backoff
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.slow_responses = 0
+        self.failures = 0
+        self.last_decrease = float('-inf')
+        self.decisions = deque(maxlen=100)
+        self.condition = threading.Condition()
+        self._async_waiters = deque()
+    
+    @property
+    def limit(self):
+        """Number of requests currently allowed in flight"""
+        return int(self.window)
+    
+    def _decide(self, action, reason):
+        self.decisions.append({'time': time.time(), 'action': action, 'reason': reason, 'window': self.limit})
+    
+    def record_success(self, latency):
+        """Grow the window additively when a response was fast and healthy"""
+        with self.condition:
+            if latency > self.latency_target:
+                self.slow_responses += 1
+                return
+            previous = self.limit
+            self.window = min(self.maximum, self.window + 1.0 / self.window)
+            if self.limit > previous:
+                self.increases += 1
+                self._decide('increase', f"latency {latency:.2f}s")
+                self._wake()
+    
+    def record_failure(self):
+        """Note an error that is not a throttling signal; the window is held"""
+        with self.condition:
+            self.failures += 1
+    
+    def record_throttle(self, reason, sent_at=None):
+        """Cut the window multiplicatively on a throttling signal
+
+        Responses to requests sent before the previous cut belong to the old
+        window, so one burst of throttled responses only cuts it once.
+        """
+        with self.condition:
+            now = time.monotonic()
+            if sent_at is not None and sent_at < self.last_decrease:
+                return
+            self.last_decrease = now
+            self.window = max(self.minimum, self.window * self.backoff)
+            self.decreases += 1
+            self._decide('decrease', reason)
+    
+    def acquire(self):
+        """Block the calling thread until the window has a free slot"""
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+    
+    async def acquire_async(self):
+        """Suspend the calling coroutine until the window has a free slot"""
+        while True:
+            with self.condition:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+            await waiter
+    
+    def release(self):
+        """Return a slot taken by acquire() or acquire_async()"""
+        with self.condition:
+            self.in_flight -= 1
+            self._wake()
+    
+    def _wake(self):
+        # Caller holds self.condition
+        self.condition.notify_all()
+        while self._async_waiters:
+            waiter = self._async_waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(self._resolve, waiter)
+    
+    @staticmethod
+    def _resolve(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+    
+    def metrics(self):
+        """Return the current window and the decisions that shaped it"""
+        with self.condition:
+            return {
+                'window': self.limit,
+                'in_flight': self.in_flight,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'slow_responses': self.slow_responses,
+                'failures': self.failures,
+                'decisions': list(self.decisions),
+            }
+
+
+def scholar_endpoint(url, params=None):
+    """Name the Scholar endpoint a request goes to: search, list_works, view_citation or other"""
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query))
+    query.update(params or {})
+    if parsed.path == '/scholar':
+        return 'search'
+    if parsed.path == '/citations' and query.get('view_op') in ('list_works', 'view_citation'):
+        return query['view_op']
+    return 'other'
+
+
+def normalize_url(url, params=None):
+    """Canonical form of a request URL with its query parameters merged and sorted"""
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    query.extend((key, str(value)) for key, value in (params or {}).items())
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{parsed.path or '/'}?{urlencode(sorted(query))}"
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values, cumulative like Prometheus buckets"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self):
+        """(upper bound, observations at or below it) pairs ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+    
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != float('inf') else self.bounds[-1]
+        return self.bounds[-1]
+    
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': {('+Inf' if bound == float('inf') else str(bound)): total for bound, total in self.cumulative()},
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request timings, sizes, status codes, retries and parse times
+
+    Each network request is split into the wait for a rate limiter token, the
+    time to the first response byte and the body download, so a slow run can be
+    pinned on rate limiting, the network or parsing. The async engine also
+    times DNS lookups and new connections (TCP and TLS) on their own; with
+    requests they are part of the time to first byte. Shared by every worker
+    thread or coroutine of a run.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints = {}
+    
+    def _endpoint(self, endpoint):
+        # Caller holds self.lock
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = {
+                'phases': {phase: Histogram(LATENCY_BUCKETS) for phase in REQUEST_PHASES},
+                'bytes': Histogram(SIZE_BUCKETS),
+                'parse': Histogram(LATENCY_BUCKETS),
+                'status': {},
+                'errors': {},
+                'sources': {},
+                'retries': 0,
+            }
+        return metrics
+    
+    def observe_request(self, endpoint, phases, size, status):
+        """Record one request that got an HTTP response; phases maps REQUEST_PHASES to seconds, or None if skipped"""
+        with self.lock:
+            metrics = self._endpoint(endpoint)
+            for phase, seconds in phases.items():
+                if seconds is not None:
+                    metrics['phases'][phase].observe(seconds)
+            metrics['bytes'].observe(size)
+            metrics['status'][status] = metrics['status'].get(status, 0) + 1
+            metrics['sources']['network'] = metrics['sources'].get('network', 0) + 1
+    
+    def observe_error(self, endpoint, error):
+        """Count a request that failed without a usable response, by error type"""
+        with self.lock:
+            errors = self._endpoint(endpoint)['errors']
+            errors[error] = errors.get(error, 0) + 1
+    
+    def observe_source(self, endpoint, source):
+        """Count a response served without the network ('cache' or 'replay')"""
+        with self.lock:
+            sources = self._endpoint(endpoint)['sources']
+            sources[source] = sources.get(source, 0) + 1
+    
+    def observe_retry(self, endpoint):
+        with self.lock:
+            self._endpoint(endpoint)['retries'] += 1
+    
+    def observe_parse(self, endpoint, seconds):
+        with self.lock:
+            self._endpoint(endpoint)['parse'].observe(seconds)
+    
+    def snapshot(self):
+        """All metrics as a JSON-compatible dict"""
+        with self.lock:
+            return {
+                'started': self.started,
+                'uptime': round(time.time() - self.started, 3),
+                'endpoints': {
+                    endpoint: {
+                        'phases': {phase: histogram.to_dict() for phase, histogram in metrics['phases'].items()},
+                        'bytes': metrics['bytes'].to_dict(),
+                        'parse': metrics['parse'].to_dict(),
+                        'status': {str(status): count for status, count in sorted(metrics['status'].items())},
+                        'errors': dict(metrics['errors']),
+                        'sources': dict(metrics['sources']),
+                        'retries': metrics['retries'],
+                    }
+                    for endpoint, metrics in sorted(self.endpoints.items())
+                },
+            }
+    
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        
+        def histogram_lines(name, labels, histogram):
+            for bound, total in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum!r}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            lines.append('# HELP scholar_request_seconds Time spent in each phase of a request')
+            lines.append('# TYPE scholar_request_seconds histogram')
+            for endpoint, metrics in endpoints:
+                for phase, histogram in metrics['phases'].items():
+                    histogram_lines('scholar_request_seconds', f'endpoint="{endpoint}",phase="{phase}"', histogram)
+            lines.append('# HELP scholar_response_bytes Size of response bodies')
+            lines.append('# TYPE scholar_response_bytes histogram')
+            for endpoint, metrics in endpoints:
+                histogram_lines('scholar_response_bytes', f'endpoint="{endpoint}"', metrics['bytes'])
+            lines.append('# HELP scholar_parse_seconds Time spent parsing a page')
+            lines.append('# TYPE scholar_parse_seconds histogram')
+            for endpoint, metrics in endpoints:
+                histogram_lines('scholar_parse_seconds', f'endpoint="{endpoint}"', metrics['parse'])
+            lines.append('# HELP scholar_responses_total Responses received, by HTTP status')
+            lines.append('# TYPE scholar_responses_total counter')
+            for endpoint, metrics in endpoints:
+                for status, count in sorted(metrics['status'].items()):
+                    lines.append(f'scholar_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            lines.append('# HELP scholar_request_errors_total Requests that failed without a usable response')
+            lines.append('# TYPE scholar_request_errors_total counter')
+            for endpoint, metrics in endpoints:
+                for error, count in sorted(metrics['errors'].items()):
+                    lines.append(f'scholar_request_errors_total{{endpoint="{endpoint}",error="{error}"}} {count}')
+            lines.append('# HELP scholar_pages_total Pages obtained, by source (network, cache or replay)')
+            lines.append('# TYPE scholar_pages_total counter')
+            for endpoint, metrics in endpoints:
+                for source, count in sorted(metrics['sources'].items()):
+                    lines.append(f'scholar_pages_total{{endpoint="{endpoint}",source="{source}"}} {count}')
+            lines.append('# HELP scholar_retries_total Requests sent again after a failure')
+            lines.append('# TYPE scholar_retries_total counter')
+            for endpoint, metrics in endpoints:
+                lines.append(f'scholar_retries_total{{endpoint="{endpoint}"}} {metrics["retries"]}')
+        return '\n'.join(lines) + '\n'
+    
+    def summary(self):
+        """Short per-endpoint table for the end of a run"""
+        snapshot = self.snapshot()['endpoints']
+        lines = [f"{'endpoint':<14} {'requests':>8} {'wait p50':>9} {'ttfb p50':>9} {'ttfb p99':>9} "
+                 f"{'download p50':>13} {'parse p50':>10} {'MB':>7} {'errors':>7}"]
+        for endpoint, metrics in snapshot.items():
+            phases = metrics['phases']
+            lines.append(f"{endpoint:<14} {phases['total']['count']:>8} {phases['rate_limit_wait']['p50']:>8}s "
+                         f"{phases['ttfb']['p50']:>8}s {phases['ttfb']['p99']:>8}s {phases['download']['p50']:>12}s "
+                         f"{metrics['parse']['p50']:>9}s {metrics['bytes']['sum'] / 1e6:>7.1f} "
+                         f"{sum(metrics['errors'].values()):>7}")
+        return '\n'.join(lines)
+
+
+class MetricsReporter:
+    """Expose RequestMetrics while a run is going
+
+    Serves the Prometheus text format on http://host:port/metrics (and the
+    JSON snapshot on /metrics.json) and/or rewrites a JSON dump every
+    interval seconds, replacing the file atomically so readers never see a
+    partial write.
+    """
+
+    def __init__(self, metrics, port=None, json_path=None, interval=DEFAULT_METRICS_INTERVAL, host='127.0.0.1'):
+        self.metrics = metrics
+        self.json_path = json_path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.server = None
+        self.threads = []
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, port), self._handler())
+            self.server.daemon_threads = True
+            self.threads.append(threading.Thread(target=self.server.serve_forever, daemon=True))
+        if json_path:
+            self.threads.append(threading.Thread(target=self._dump_periodically, daemon=True))
+        for thread in self.threads:
+            thread.start()
+    
+    @property
+    def url(self):
+        if self.server is None:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+    
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        
+        return Handler
+    
+    def _dump_periodically(self):
+        while not self.stopped.wait(self.interval):
+            self.dump()
+    
+    def dump(self):
+        """Write the current snapshot to the JSON dump file"""
+        tmp_path = f"{self.json_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.metrics.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.json_path)
+        except OSError as e:
+            log_event(logging.ERROR, 'metrics_dump_failed', f"Error writing metrics to {self.json_path}: {e}",
+                      path=self.json_path, error=str(e))
+    
+    def close(self):
+        """Stop serving and write a final dump"""
+        self.stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.json_path:
+            self.dump()
+
+
+class ResponseCache:
+    """SQLite-backed cache of response bodies with per-endpoint TTLs and LRU eviction
+
+    Profile list pages sorted by pubdate change whenever the author publishes,
+    so they expire quickly; paper detail pages barely change and live long.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_MAX_BYTES, ttls=None):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_CACHE_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+    
+    def ttl_for(self, url, params=None):
+        """Seconds a response from this URL stays fresh"""
+        endpoint = scholar_endpoint(url, params)
+        if endpoint == 'list_works':
+            query = dict(parse_qsl(urlparse(url).query))
+            query.update(params or {})
+            if query.get('sortby') != 'pubdate':
+                endpoint = 'list_works_other'
+        return endpoint, self.ttls.get(endpoint, self.ttls['other'])
+    
+    def get(self, url, params=None):
+        """Return the cached body for a request, or None if missing or expired"""
+        key = normalize_url(url, params)
+        _, ttl = self.ttl_for(url, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute('SELECT content, stored_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None or now - row[1] > ttl:
+                self.misses += 1
+                return None
+            self.db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return row[0]
+    
+    def put(self, url, params, content):
+        """Store a response body and evict least recently used entries beyond the size cap"""
+        key = normalize_url(url, params)
+        endpoint, _ = self.ttl_for(url, params)
+        now = time.time()
+        with self.lock:
+            previous = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses (key, endpoint, content, size, stored_at, last_used) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, endpoint, content, len(content), now, now))
+            self.total_bytes += len(content) - (previous[0] if previous else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+    
+    def invalidate(self, url, params=None):
+        """Drop the cached body for a request so the next fetch goes to the network"""
+        key = normalize_url(url, params)
+        with self.lock:
+            row = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if row:
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.total_bytes -= row[0]
+    
+    def _evict(self):
+        # Caller holds self.lock; trim to 90% of the cap so eviction isn't run on every put
+        target = self.max_bytes * 0.9
+        rows = self.db.execute('SELECT key, size FROM responses ORDER BY last_used').fetchall()
+        self.db.execute('BEGIN')
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self.total_bytes -= size
+            self.evictions += 1
+        self.db.execute('COMMIT')
+    
+    def stats(self):
+        """Return hit, miss and size counters"""
+        with self.lock:
+            entries = self.db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self.total_bytes,
+        }
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class ResponseArchive:
+    """Directory of raw responses, written by --record and served back by --replay
+
+    Each body is stored as <endpoint>/<hash of its normalized URL>.html, and
+    index.jsonl lists the URL behind every file. A replay needs no network
+    and never hits the rate limiter, so pipeline and parsing runs are
+    deterministic; the directory also works as benchmark_parsers.py --corpus.
+    """
+
+    def __init__(self, directory, replay=False):
+        self.directory = os.path.expanduser(directory)
+        self.replay = replay
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+        self.lock = threading.Lock()
+        if replay:
+            if not os.path.isdir(self.directory):
+                raise FileNotFoundError(f"No recorded responses in {self.directory}")
+            self.index = None
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            self.index = open(os.path.join(self.directory, 'index.jsonl'), 'a')
+    
+    def path_for(self, url, params=None):
+        """Normalized URL of a request and the file its response is stored in"""
+        key = normalize_url(url, params)
+        name = hashlib.sha1(key.encode()).hexdigest()[:20] + '.html'
+        return key, os.path.join(self.directory, scholar_endpoint(url, params), name)
+    
+    def load(self, url, params=None):
+        """Return the recorded body for a request; raises LookupError if it was never recorded"""
+        key, path = self.path_for(url, params)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            with self.lock:
+                self.missing += 1
+            raise LookupError(f"No recorded response for {key}")
+        with self.lock:
+            self.replayed += 1
+        return content
+    
+    def save(self, url, params, content):
+        """Store a response body, replacing any earlier recording of the same request"""
+        key, path = self.path_for(url, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write under a private name first so readers never see half a page
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(content)
+        os.replace(temporary, path)
+        entry = {'url': key, 'file': os.path.relpath(path, self.directory), 'size': len(content), 'recorded_at': time.time()}
+        with self.lock:
+            self.recorded += 1
+            self.index.write(json.dumps(entry) + '\n')
+            self.index.flush()
+    
+    def close(self):
+        if self.index:
+            with self.lock:
+                self.index.close()
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of completed detail fetches, used to resume interrupted runs
+
+    Each line holds one paper's citation_for_view id and the details fetched
+    for it, written and flushed as soon as the fetch finishes. The file is only
+    created by the first entry, so a run that fetches nothing leaves none
+    behind. Without resume an existing journal is never overwritten:
+    FileExistsError is raised.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            if not resume:
+                raise FileExistsError(f"{path} holds the journal of an unfinished run")
+            self.completed = self._load()
+            log_event(logging.INFO, 'checkpoint_resumed',
+                      f"Resuming: {len(self.completed)} papers already fetched according to {path}",
+                      papers=len(self.completed), path=path)
+        self.file = None
+    
+    def _load(self):
+        completed = {}
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short if the previous run was killed mid-write
+                    continue
+                completed[entry['id']] = entry['details']
+        return completed
+    
+    def lookup(self, paper):
+        """Return the journaled details for a paper, or None if it still has to be fetched"""
+        return self.completed.get(citation_for_view(paper.get('detail_url')))
+    
+    def record(self, paper, details):
+        """Journal the details fetched for a paper"""
+        paper_id = citation_for_view(paper.get('detail_url'))
+        if not paper_id or not details:
+            return
+        line = json.dumps({'id': paper_id, 'details': details}, default=json_default) + '\n'
+        with self.lock:
+            self.completed[paper_id] = details
+            if self.file is None:
+                self.file = open(self.path, 'a')
+            self.file.write(line)
+            self.file.flush()
+    
+    def close(self, remove=False):
+        """Close the journal, deleting it when the run it protects has completed"""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def jsonl_compression(path):
+    """Compression implied by a file name: 'gzip', 'zstd' or None"""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def open_jsonl(fileobj, compression, mode):
+    """Wrap a binary file in a text stream that compresses on write or decompresses on read"""
+    if compression == 'gzip':
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode=mode + 'b')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("Reading or writing .zst files requires zstandard (pip install zstandard)")
+        if mode == 'w':
+            fileobj = zstandard.ZstdCompressor().stream_writer(fileobj, closefd=False)
+        else:
+            fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+    return io.TextIOWrapper(fileobj, encoding='utf-8')
+
+
+def json_default(value):
+    """json.dump hook that writes Paper records as dicts and citation histogram arrays as lists"""
+    if isinstance(value, Paper):
+        return value.to_dict()
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def read_jsonl(path):
+    """Yield the records of a (possibly compressed) JSON Lines file"""
+    with open(path, 'rb') as raw, open_jsonl(raw, jsonl_compression(path), 'r') as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short if the writing run was killed
+                    continue
+        except EOFError:
+            # A gzip stream that was never closed ends without its trailer
+            return
+
+
+class JsonlWriter:
+    """Streams result records to a JSON Lines file as they are produced
+
+    Every record is flushed as soon as it is written, so memory stays flat on
+    large profiles and the file can be tailed while the run is going. The
+    extension picks gzip (.gz) or zstd (.zst) compression.
+    """
+
+    def __init__(self, path, fsync_every=DEFAULT_FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every  # 0 only syncs when the file is closed
+        self.count = 0
+        self.raw = open(path, 'wb')
+        self.file = open_jsonl(self.raw, jsonl_compression(path), 'w')
+    
+    def write(self, record):
+        """Append one record and flush it through the compressor to the OS"""
+        self.file.write(json.dumps(record, default=json_default) + '\n')
+        self.file.flush()
+        self.count += 1
+        if self.fsync_every and self.count % self.fsync_every == 0:
+            os.fsync(self.raw.fileno())
+    
+    def close(self):
+        """Finish the compressed stream and sync the file to disk"""
+        if self.file.buffer is not self.raw:
+            # Writes the gzip/zstd trailer but leaves the file underneath open
+            self.file.close()
+        else:
+            self.file.flush()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.file.close()
+        self.raw.close()
+
+
+def parse_int(value):
+    """First integer in a scraped string ("1,234*" -> 1234), or None"""
+    match = re.search(r'\d[\d,]*', value or '')
+    return int(match.group().replace(',', '')) if match else None
+
+
+def parse_publication_date(value):
+    """Scholar publication date ("2020/3/5", "2020/3" or "2020") as a date, missing parts set to 1"""
+    parts = [int(part) for part in re.findall(r'\d+', value or '')[:3]]
+    if not parts:
+        return None
+    try:
+        return datetime.date(parts[0], *(parts[1:] + [1, 1])[:2])
+    except ValueError:
+        return None
+
+
+# How each scraped field is held by Paper: (record key, slot, kind). Keys not
+# listed here end up in Paper.extra. 'Description' and 'abstract' carry the
+# same text on detail pages, so both map to one slot.
+PAPER_FIELDS = (
+    ('title', 'title', 'text'),
+    ('detail_url', 'detail_url', 'text'),
+    ('authors', 'authors', 'names'),
+    ('venue', 'venue', 'interned'),
+    ('citations', 'citations', 'count'),
+    ('year', 'year', 'int'),
+    ('Authors', 'full_authors', 'names'),
+    ('Publication date', 'publication_date', 'text'),
+    ('Journal', 'journal', 'interned'),
+    ('Volume', 'volume', 'text'),
+    ('Issue', 'issue', 'text'),
+    ('Pages', 'pages', 'text'),
+    ('Publisher', 'publisher', 'interned'),
+    ('Description', 'abstract', 'text'),
+    ('Total citations', 'total_citations', 'text'),
+    ('abstract', 'abstract', 'text'),
+    ('citation_years', 'citation_years', 'years'),
+    ('citation_counts', 'citation_counts', 'counts'),
+)
+PAPER_SLOTS = {key: (slot, kind) for key, slot, kind in PAPER_FIELDS}
+# Keys whose slot other keys share too, e.g. 'Description' -> ('abstract',)
+PAPER_SLOT_SHARERS = {
+    key: tuple(other for other, other_slot, _ in PAPER_FIELDS if other != key and other_slot == slot)
+    for key, slot, _ in PAPER_FIELDS
+    if [other_slot for _, other_slot, _ in PAPER_FIELDS].count(slot) > 1
+}
+# Papers built the same way set their keys in the same order, so each distinct
+# key order is held once and shared
+PAPER_KEY_ORDERS = {(): ()}
+
+
+class Paper:
+    """Compact record of one paper, built from a list row and then filled in from its detail page
+
+    Citations and year are ints (scraped text that is not a plain number,
+    such as the empty citations link of an uncited paper, is kept as is),
+    venues, publishers and author names are interned so repeats across papers
+    share one string, and the abstract is held once. Indexing, get(), `in`,
+    iteration, len(), keys()/values()/items(), truth value and update()
+    behave as on the dict the parser used to build, so code written against
+    plain dicts (including dict(paper)) keeps working; to_dict() returns that
+    JSON-ready dict, keys in the order they were set.
+    """
+
+    __slots__ = tuple(dict.fromkeys(slot for _, slot, _ in PAPER_FIELDS)) + ('extra', 'keys_set')
+    
     def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, None)
+        self.keys_set = ()
+    
+    @classmethod
+    def from_dict(cls, record):
+        """Build a Paper from a scraped or previously saved dict"""
+        paper = cls()
+        paper.update(record)
+        return paper
+    
+    def __setitem__(self, key, value):
+        if key not in self.keys_set:
+            keys_set = self.keys_set + (sys.intern(key),)
+            self.keys_set = PAPER_KEY_ORDERS.setdefault(keys_set, keys_set)
+        # A value that differs from the one a slot-sharing key holds (e.g.
+        # Description vs abstract) is kept apart so neither is lost
+        if key not in PAPER_SLOTS or any(other in self.keys_set and self.get(other) != value
+                                         for other in PAPER_SLOT_SHARERS.get(key, ())):
+            if self.extra is None:
+                self.extra = {}
+            self.extra[sys.intern(key)] = value
+            return
+        if self.extra and key in self.extra:
+            del self.extra[key]
+        slot, kind = PAPER_SLOTS[key]
+        if value is None:
+            pass
+        elif kind == 'names':
+            value = tuple(sys.intern(name) for name in value.split(', '))
+        elif kind == 'interned':
+            value = sys.intern(value)
+        elif kind in ('count', 'int'):
+            # Only plain numbers become ints, so every value reads back exactly as scraped
+            if isinstance(value, str) and value.isdigit() and str(int(value)) == value:
+                value = int(value)
+        elif kind == 'years':
+            value = array('H', value)
+        elif kind == 'counts':
+            value = array('I', value)
+        setattr(self, slot, value)
+    
+    def get(self, key, default=None):
+        if key not in self.keys_set:
+            return default
+        if key not in PAPER_SLOTS or (self.extra and key in self.extra):
+            value = self.extra.get(key) if self.extra else None
+            return default if value is None else value
+        slot, kind = PAPER_SLOTS[key]
+        value = getattr(self, slot)
+        if value is None:
+            return default
+        if kind == 'names':
+            return ', '.join(value)
+        if kind in ('count', 'int'):
+            return str(value)
+        if kind in ('years', 'counts'):
+            return value.tolist()
+        return value
+    
+    def __getitem__(self, key):
+        if key not in self.keys_set:
+            raise KeyError(key)
+        return self.get(key)
+    
+    def __contains__(self, key):
+        return self.get(key) is not None
+    
+    def __iter__(self):
+        return iter(self.keys_set)
+    
+    def __len__(self):
+        # Also makes a row nothing could be read from falsy, like the dict it replaces
+        return len(self.keys_set)
+    
+    def keys(self):
+        return self.to_dict().keys()
+    
+    def values(self):
+        return self.to_dict().values()
+    
+    def update(self, record):
+        """Merge scraped fields, e.g. the details returned by parse_paper_details"""
+        for key, value in record.items():
+            self[key] = value
+    
+    def to_dict(self):
+        """JSON-ready dict with the same keys and string values the parser has always written"""
+        return {key: self.get(key) for key in self.keys_set}
+    
+    def items(self):
+        return self.to_dict().items()
+    
+    def __repr__(self):
+        return f"Paper({self.title!r}, year={self.year}, citations={self.citations})"
+
+
+def typed_paper_record(paper):
+    """Flatten a Paper or paper dict into the typed columns of paper_arrow_schema"""
+    authors = paper.get('Authors') or paper.get('authors') or ''
+    return {
+        'id': citation_for_view(paper.get('detail_url')),
+        'title': paper.get('title'),
+        'detail_url': paper.get('detail_url'),
+        # Full names from the detail page when available; the list row abbreviates them
+        'authors': [name.strip() for name in authors.split(',') if name.strip()],
+        'venue': paper.get('venue'),
+        'citations': parse_int(paper.get('citations')),
+        'year': parse_int(paper.get('year')),
+        'publication_date': parse_publication_date(paper.get('Publication date')),
+        'journal': paper.get('Journal'),
+        'volume': paper.get('Volume'),
+        'issue': paper.get('Issue'),
+        'pages': paper.get('Pages'),
+        'publisher': paper.get('Publisher'),
+        'abstract': paper.get('abstract') or paper.get('Description'),
+        'citation_years': list(paper['citation_years']) if 'citation_years' in paper else None,
+        'citation_counts': list(paper['citation_counts']) if 'citation_counts' in paper else None,
+        'extra': [(key, str(value)) for key, value in paper.items() if key not in TYPED_PAPER_KEYS],
+    }
+
+
+def paper_arrow_schema():
+    """Arrow schema of the rows built by typed_paper_record"""
+    return pa.schema([
+        ('id', pa.string()),
+        ('title', pa.string()),
+        ('detail_url', pa.string()),
+        ('authors', pa.list_(pa.string())),
+        ('venue', pa.string()),
+        ('citations', pa.int32()),
+        ('year', pa.int16()),
+        ('publication_date', pa.date32()),
+        ('journal', pa.string()),
+        ('volume', pa.string()),
+        ('issue', pa.string()),
+        ('pages', pa.string()),
+        ('publisher', pa.string()),
+        ('abstract', pa.string()),
+        ('citation_years', pa.list_(pa.uint16())),
+        ('citation_counts', pa.list_(pa.uint32())),
+        ('extra', pa.map_(pa.string(), pa.string())),
+    ])
+
+
+class ArrowWriter:
+    """Writes paper records to a typed Parquet (.parquet) or Arrow IPC (.arrow, .feather) file
+
+    Records are buffered and written out as one row group (or record batch)
+    every row_group_size papers, so only that many are held in memory.
+    """
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        if pa is None:
+            raise ImportError("Parquet and Arrow output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.row_group_size = max(row_group_size, 1)
+        self.schema = paper_arrow_schema()
+        self.rows = []
+        self.count = 0
+        if path.endswith('.parquet'):
+            self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+    
+    def write(self, paper):
+        """Add one paper, writing a row group once enough are buffered"""
+        self.rows.append(typed_paper_record(paper))
+        self.count += 1
+        if len(self.rows) >= self.row_group_size:
+            self._flush()
+    
+    def _flush(self):
+        if self.rows:
+            self.writer.write_batch(pa.RecordBatch.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+    
+    def close(self):
+        """Write the last partial row group and the file footer"""
+        self._flush()
+        self.writer.close()
+
+
+def open_output_sink(path, fsync_every=DEFAULT_FSYNC_EVERY, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Streaming writer for an --output path, or None if it is a plain JSON file"""
+    if path.endswith(JSONL_SUFFIXES):
+        return JsonlWriter(path, fsync_every)
+    if path.endswith(ARROW_SUFFIXES):
+        return ArrowWriter(path, row_group_size)
+    return None
+
+
+class ScholarStore:
+    """Indexed SQLite store of every profile and paper scraped, across authors and runs
+
+    Profiles are keyed on their user id and papers on their citation_for_view
+    id, so repeat runs upsert instead of duplicating. Papers are buffered and
+    written in batches, one transaction each, to a WAL-mode database.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_STORE_BATCH):
+        self.path = os.path.expanduser(path)
+        self.batch_size = max(batch_size, 1)
+        self.pending = []
+        self.lock = threading.Lock()
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                user_id TEXT PRIMARY KEY,
+                name TEXT,
+                url TEXT,
+                info TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS papers (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                position INTEGER,
+                title TEXT,
+                detail_url TEXT,
+                authors TEXT,
+                venue TEXT,
+                citations INTEGER,
+                year INTEGER,
+                publication_date TEXT,
+                journal TEXT,
+                publisher TEXT,
+                abstract TEXT,
+                record TEXT NOT NULL,
+                listed_at REAL NOT NULL,
+                detailed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS paper_authors (
+                paper_id TEXT NOT NULL,
+                author TEXT NOT NULL,
+                PRIMARY KEY (paper_id, author)
+            );
+            CREATE INDEX IF NOT EXISTS papers_user ON papers (user_id, position);
+            CREATE INDEX IF NOT EXISTS papers_year ON papers (year);
+            CREATE INDEX IF NOT EXISTS papers_citations ON papers (citations);
+            CREATE INDEX IF NOT EXISTS papers_venue ON papers (venue);
+            CREATE INDEX IF NOT EXISTS paper_authors_author ON paper_authors (author);
+        """)
+    
+    def save_profiles(self, profiles):
+        """Upsert the profiles returned by an author search"""
+        now = time.time()
+        rows = [(dict(parse_qsl(urlparse(profile['url']).query)).get('user'), profile.get('name'), profile['url'],
+                 profile.get('info'), now) for profile in profiles]
+        with self.lock:
+            self.db.execute('BEGIN')
+            self.db.executemany("""
+                INSERT INTO profiles (user_id, name, url, info, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    name = excluded.name, url = excluded.url, info = excluded.info, updated_at = excluded.updated_at
+            """, [row for row in rows if row[0]])
+            self.db.execute('COMMIT')
+    
+    def save_paper(self, paper, position=None, detailed=True):
+        """Queue a paper for upsert; detailed=False records only its list row"""
+        record = typed_paper_record(paper)
+        if not record['id']:
+            return
+        now = time.time()
+        row = (record['id'], record['id'].split(':')[0], position, record['title'], record['detail_url'],
+               ', '.join(record['authors']), record['venue'], record['citations'], record['year'],
+               record['publication_date'].isoformat() if record['publication_date'] else None,
+               record['journal'], record['publisher'], record['abstract'], json.dumps(paper, default=json_default), now,
+               now if detailed else None)
+        with self.lock:
+            self.pending.append((row, record['authors'] if detailed else None))
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+    
+    def _flush(self):
+        # Caller holds self.lock
+        if not self.pending:
+            return
+        self.db.execute('BEGIN')
+        self.db.executemany("""
+            INSERT INTO papers (id, user_id, position, title, detail_url, authors, venue, citations, year,
+                                publication_date, journal, publisher, abstract, record, listed_at, detailed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                position = COALESCE(excluded.position, papers.position),
+                title = excluded.title,
+                detail_url = excluded.detail_url,
+                venue = excluded.venue,
+                citations = excluded.citations,
+                year = excluded.year,
+                listed_at = excluded.listed_at,
+                -- A failed detail fetch must not wipe details stored by an earlier run
+                authors = CASE WHEN excluded.detailed_at IS NULL THEN papers.authors ELSE excluded.authors END,
+                publication_date = COALESCE(excluded.publication_date, papers.publication_date),
+                journal = COALESCE(excluded.journal, papers.journal),
+                publisher = COALESCE(excluded.publisher, papers.publisher),
+                abstract = COALESCE(excluded.abstract, papers.abstract),
+                record = CASE WHEN excluded.detailed_at IS NULL THEN papers.record ELSE excluded.record END,
+                detailed_at = COALESCE(excluded.detailed_at, papers.detailed_at)
+        """, [row for row, _ in self.pending])
+        for row, authors in self.pending:
+            if authors is not None:
+                self.db.execute('DELETE FROM paper_authors WHERE paper_id = ?', (row[0],))
+                self.db.executemany('INSERT OR IGNORE INTO paper_authors (paper_id, author) VALUES (?, ?)',
+                                    [(row[0], author) for author in authors])
+        self.db.execute('COMMIT')
+        self.pending = []
+    
+    def flush(self):
+        """Commit every queued paper"""
+        with self.lock:
+            self._flush()
+    
+    def known_papers(self, user_id):
+        """Stored papers of one profile, as an ordered {citation_for_view: paper} mapping
+
+        Papers whose details failed are included, so an incremental sync still
+        pages past them and then fetches their details again.
+        """
+        with self.lock:
+            self._flush()
+            rows = self.db.execute("""
+                SELECT id, record FROM papers WHERE user_id = ?
+                ORDER BY year DESC, position
+            """, (user_id,)).fetchall()
+        return {paper_id: Paper.from_dict(json.loads(record)) for paper_id, record in rows}
+    
+    def query(self, sql, *params):
+        """Run a read-only SQL query against the store and return its rows"""
+        with self.lock:
+            self._flush()
+            return self.db.execute(sql, params).fetchall()
+    
+    def stats(self):
+        """Return profile and paper counts"""
+        with self.lock:
+            self._flush()
+            return {
+                'profiles': self.db.execute('SELECT COUNT(*) FROM profiles').fetchone()[0],
+                'papers': self.db.execute('SELECT COUNT(*) FROM papers').fetchone()[0],
+            }
+    
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.db.close()
+
+
+class RequestTrace:
+    """DNS, connect and header send times of one aiohttp request, filled in by request_trace_config()"""
+
+    def __init__(self):
+        self.dns = None  # Seconds spent resolving the host, if it was not cached
+        self.connect = None  # Seconds spent opening a new connection (TCP and TLS), if none was reused
+        self.headers_sent = None  # When the request headers went out
+        self.dns_started = None
+        self.connect_started = None
+        self.dns_before_connect = 0.0
+
+
+def request_trace_config():
+    """aiohttp TraceConfig that times each request's DNS lookup and new connection into its RequestTrace"""
+    
+    async def dns_start(session, context, params):
+        context.trace_request_ctx.dns_started = time.monotonic()
+    
+    async def dns_end(session, context, params):
+        trace = context.trace_request_ctx
+        trace.dns = (trace.dns or 0.0) + time.monotonic() - trace.dns_started
+    
+    async def connect_start(session, context, params):
+        trace = context.trace_request_ctx
+        trace.connect_started = time.monotonic()
+        trace.dns_before_connect = trace.dns or 0.0
+    
+    async def connect_end(session, context, params):
+        trace = context.trace_request_ctx
+        # Connection set-up includes the DNS lookup, which is counted on its own
+        dns = (trace.dns or 0.0) - trace.dns_before_connect
+        trace.connect = (trace.connect or 0.0) + time.monotonic() - trace.connect_started - dns
+    
+    async def headers_sent(session, context, params):
+        context.trace_request_ctx.headers_sent = time.monotonic()
+    
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(dns_start)
+    trace_config.on_dns_resolvehost_end.append(dns_end)
+    trace_config.on_connection_create_start.append(connect_start)
+    trace_config.on_connection_create_end.append(connect_end)
+    trace_config.on_request_headers_sent.append(headers_sent)
+    return trace_config
+
+
+class RequestPipeline:
+    """Replay, cache, deadline, metrics, throttle detection and retry decisions around each request
+
+    Shared by PooledTransport and AsyncScholarProfileParser, which only add the
+    blocking or asyncio network calls. Both set rate_limiter, concurrency, cache,
+    archive, metrics, retry_policy and deadline.
+    """
+
+    def stored_response(self, url, params=None):
+        """Body served without the network, from the replay archive or a fresh cache entry, or None"""
+        if self.archive and self.archive.replay:
+            if self.metrics:
+                self.metrics.observe_source(scholar_endpoint(url, params), 'replay')
+            return self.archive.load(url, params)
+        content = self.cache.get(url, params) if self.cache else None
+        if content is not None:
+            if self.metrics:
+                self.metrics.observe_source(scholar_endpoint(url, params), 'cache')
+            if self.archive:
+                self.archive.save(url, params, content)
+        return content
+    
+    def keep_response(self, url, params, content):
+        """Store a body fetched over the network in the cache and the archive"""
+        if self.cache:
+            self.cache.put(url, params, content)
+        if self.archive:
+            self.archive.save(url, params, content)
+    
+    def check_deadline(self, url):
+        """Refuse to send a request once the run deadline has passed"""
+        if self.deadline is not None and self.deadline.expired():
+            raise DeadlineExceeded(f"Run deadline passed before requesting {url}")
+    
+    def request_failed(self, url, params, error):
+        """Count a request that got no response, raising DeadlineExceeded if the run deadline cut it short"""
+        if self.deadline is not None and self.deadline.expired():
+            # Cut short by the run deadline rather than by the server
+            raise DeadlineExceeded(f"Run deadline passed while requesting {url}") from error
+        if self.concurrency:
+            self.concurrency.record_failure()
+        if self.metrics:
+            self.metrics.observe_error(scholar_endpoint(url, params), type(error).__name__)
+    
+    def response_received(self, url, params, response, status, content, queued, started, first_byte, trace=None):
+        """Record a response and feed the concurrency controller, raising ScholarBlockedError when throttled
+
+        With a RequestTrace, DNS and connect time are recorded on their own and
+        the time to first byte starts once the request headers were sent.
+        """
+        if self.metrics:
+            finished = time.monotonic()
+            sent = trace.headers_sent if trace and trace.headers_sent else started
+            self.metrics.observe_request(scholar_endpoint(url, params), {
+                'rate_limit_wait': started - queued,
+                'dns': trace.dns if trace else None,
+                'connect': trace.connect if trace else None,
+                'ttfb': first_byte - sent,
+                'download': finished - first_byte,
+                'total': finished - queued,
+            }, len(content), status)
+        block_reason = detect_block(status, response.url, content)
+        if block_reason:
+            if self.metrics:
+                self.metrics.observe_error(scholar_endpoint(url, params), 'blocked')
+            if self.concurrency:
+                self.concurrency.record_throttle(block_reason, sent_at=started)
+            raise ScholarBlockedError(f"{block_reason} for {url}", status,
+                                      parse_retry_after(response.headers.get('Retry-After')))
+        if self.concurrency:
+            if response.ok:
+                self.concurrency.record_success(time.monotonic() - started)
+            else:
+                self.concurrency.record_failure()
+    
+    def retry_delay(self, url, params, attempt, error):
+        """Seconds to wait before retrying a request that failed attempt + 1 times, or None to give up"""
+        endpoint = scholar_endpoint(url, params)
+        delay = self.retry_policy.next_delay(endpoint, attempt, error)
+        if delay is None or (self.deadline is not None and delay >= self.deadline.remaining()):
+            return None
+        log_event(logging.WARNING, 'retry', f"Retrying {url} in {delay:.1f}s (retry {attempt + 1}): {error}",
+                  endpoint=endpoint, url=url, attempt=attempt + 1, delay=round(delay, 3),
+                  failure=classify_failure(error), error=str(error))
+        if self.metrics:
+            self.metrics.observe_retry(endpoint)
+        return delay
+
+
+class PooledTransport(RequestPipeline):
+    """Thread-safe HTTP transport that shares one keep-alive connection pool across workers"""
+
+    def __init__(self, pool_size=4, headers=None, rate_limiter=None, cache=None, archive=None, metrics=None,
+                 retry_policy=None, timeout=DEFAULT_TIMEOUT):
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.pool_size = 0
+        self.adapter = None
+        self._stats_lock = threading.Lock()
+        self._requests_sent = 0
+        self._retired_connections = 0  # Connections opened by adapters replaced on resize
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.concurrency = None  # AdaptiveConcurrency fed with latency and throttle signals
+        self.cache = cache  # Optional ResponseCache consulted before the network
+        self.archive = archive  # Optional ResponseArchive to record into or replay from
+        self.metrics = metrics  # Optional RequestMetrics recording every request
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout  # (connect, read) seconds
+        self.deadline = None  # Deadline of the current run, if it has one
+        self._mount(pool_size)
+
+    def _mount(self, pool_size):
+        """Mount an adapter whose per-host pool holds pool_size connections"""
+        # pool_block makes extra workers wait for a free connection instead of
+        # opening throwaway ones that are discarded after a single request.
+        # Checkout itself is handled by urllib3's internal LIFO queue, so the
+        # most recently used (still warm) connection is handed out first.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        if self.adapter is not None:
+            self._retired_connections += self._count_connections(self.adapter)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.adapter = adapter
+        self.pool_size = pool_size
+
+    def ensure_pool_size(self, pool_size):
+        """Grow the pool so every worker can hold a connection at the same time"""
+        with self._stats_lock:
+            if pool_size > self.pool_size:
+                self._mount(pool_size)
+
+    def get(self, url, **kwargs):
+        """Issue a GET request over a pooled connection"""
+        params = kwargs.get('params')
+        queued = time.monotonic()
+        self.rate_limiter.acquire(self.deadline)
+        self.check_deadline(url)
+        timeout = self.timeout
+        if self.deadline is not None:
+            timeout = tuple(self.deadline.cap(seconds) for seconds in timeout)
+        with self._stats_lock:
+            self._requests_sent += 1
+        started = time.monotonic()
+        try:
+            # Streamed so the wait for the headers and the body download are timed apart
+            response = self.session.get(url, stream=True, timeout=timeout, **kwargs)
+            first_byte = time.monotonic()
+            content = response.content
+        except Exception as e:
+            self.request_failed(url, params, e)
+            raise
+        
+        self.response_received(url, params, response, response.status_code, content, queued, started, first_byte)
+        return response
+    
+    def get_content(self, url, params=None):
+        """GET a page over the network, retrying throttled and transient failures under the retry policy"""
+        attempt = 0
+        while True:
+            try:
+                response = self.get(url, params=params)
+                response.raise_for_status()
+                return response.content
+            except Exception as e:
+                delay = self.retry_delay(url, params, attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+
+    def fetch(self, url, params=None):
+        """GET a page and return its body bytes, serving fresh copies from the cache"""
+        content = self.stored_response(url, params)
+        if content is None:
+            content = self.get_content(url, params)
+            self.keep_response(url, params, content)
+        return content
+    
+    @staticmethod
+    def _count_connections(adapter):
+        """Count the connections an adapter's pools have opened so far"""
+        pools = adapter.poolmanager.pools
+        connections = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        return connections
+
+    def stats(self):
+        """Return connection reuse statistics for the pool"""
+        with self._stats_lock:
+            requests_sent = self._requests_sent
+            connections = self._retired_connections + self._count_connections(self.adapter)
+        reused = max(requests_sent - connections, 0)
+        return {
+            'pool_size': self.pool_size,
+            'requests': requests_sent,
+            'connections_opened': connections,
+            'connections_reused': reused,
+            'reuse_ratio': round(reused / requests_sent, 3) if requests_sent else 0.0,
+        }
+
+
+# Markup that opens the subtrees a targeted parse needs to keep
+LIST_ROW_START = re.compile(rb'<tr\b[^>]*\bclass="[^"]*\bgsc_a_tr\b')
+DETAIL_TABLE_START = re.compile(rb'<div\b[^>]*\bid="gsc_oci_(?:table|descr)"')
+FRAGMENT_HEAD = b'<html><head><meta charset="utf-8"></head><body>'
+
+
+def slice_list_rows(content):
+    """Cut a list page down to the markup spanning its paper rows, or None if they can't be located"""
+    match = LIST_ROW_START.search(content)
+    if not match:
+        return None
+    end = content.rfind(b'</tr>')
+    if end < match.start():
+        return None
+    return FRAGMENT_HEAD + b'<table>' + content[match.start():end + len(b'</tr>')] + b'</table></body></html>'
+
+
+def slice_paper_details(content):
+    """Cut a detail page down to the markup from the details table onwards, or None if it is missing"""
+    match = DETAIL_TABLE_START.search(content)
+    if not match:
+        return None
+    end = content.rfind(b'</body>')
+    if end < match.start():
+        end = len(content)
+    return FRAGMENT_HEAD + content[match.start():end] + b'</body></html>'
+
+
+def citation_histogram(year_labels, bars):
+    """Parallel year and count arrays from the citations chart
+
+    year_labels are the texts of the chart's year axis and bars the (href,
+    count text) of each bar. Years without citations have a label but no bar,
+    so they get a zero count; a bar's year is read from its as_yhi parameter.
+    """
+    counts = {}
+    for label in year_labels:
+        year = parse_int(label)
+        if year:
+            counts.setdefault(year, 0)
+    for href, count in bars:
+        query = dict(parse_qsl(urlparse(href).query))
+        year = parse_int(query.get('as_yhi') or query.get('as_ylo'))
+        if year:
+            counts[year] = parse_int(count) or 0
+    years = sorted(counts)
+    return array('H', years), array('I', [counts[year] for year in years])
+
+
+class SoupBackend:
+    """Pure-Python BeautifulSoup backend, always available
+
+    In targeted mode list and detail pages are first cut down to the rows or
+    details table, and SoupStrainer only builds tree nodes for those subtrees.
+    """
+
+    name = 'bs4'
+    
+    def __init__(self, targeted=True):
+        self.targeted = targeted
+        self.row_strainer = SoupStrainer('tr', class_='gsc_a_tr')
+        self.details_strainer = SoupStrainer('div', id=['gsc_oci_table', 'gsc_oci_descr'])
+    
+    def parse_profile_search(self, content, base_url):
+        """Extract profile links from a search results page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Look for the specific "User profiles for X" section
+        profiles = []
+        
+        # Find the table with profile information
+        # Based on the HTML, look for h3 with "User profiles for" followed by a table
+        profile_header = soup.find('h3', class_='gs_rt')
+        if profile_header and 'User profiles for' in profile_header.get_text():
+            # Find the table that follows this header
+            table = profile_header.find_next_sibling('table')
+            if table:
+                # Look for h4 elements with author links
+                author_links = table.find_all('h4', class_='gs_rt2')
+                
+                for h4 in author_links:
+                    link = h4.find('a')
+                    if link and '/citations?user=' in link.get('href', ''):
+                        profile_url = urljoin(base_url, link['href'])
+                        profile_name = link.get_text(strip=True)
+                        
+                        # Extract additional info (email, citations)
+                        parent_div = h4.parent
+                        profile_info = parent_div.get_text(strip=True) if parent_div else profile_name
+                        
+                        profiles.append({
+                            'name': profile_name,
+                            'url': profile_url,
+                            'info': profile_info
+                        })
+        
+        return profiles
+    
+    def parse_profile_page(self, content, base_url):
+        """Extract the papers listed on one publications list page"""
+        if self.targeted:
+            content = slice_list_rows(content) or content
+            soup = BeautifulSoup(content, 'html.parser', parse_only=self.row_strainer)
+        else:
+            soup = BeautifulSoup(content, 'html.parser')
+        # Find all paper rows in the table
+        return [self.extract_paper_info(row, base_url) for row in soup.find_all('tr', class_='gsc_a_tr')]
+    
+    def extract_paper_info(self, row, base_url):
+        """Extract basic paper information from a profile row"""
+        paper_info = {}
+        
+        try:
+            # Get title and link to detailed page
+            title_cell = row.find('td', class_='gsc_a_t')
+            if title_cell:
+                title_link = title_cell.find('a')
+                if title_link:
+                    paper_info['title'] = title_link.get_text(strip=True)
+                    # Build full URL for paper details
+                    detail_href = title_link.get('href', '')
+                    if detail_href:
+                        paper_info['detail_url'] = urljoin(base_url, detail_href)
+                
+                # Get authors and publication info
+                gray_divs = title_cell.find_all('div', class_='gs_gray')
+                if len(gray_divs) >= 1:
+                    paper_info['authors'] = gray_divs[0].get_text(strip=True)
+                if len(gray_divs) >= 2:
+                    paper_info['venue'] = gray_divs[1].get_text(strip=True)
+            
+            # Get citations count
+            citations_cell = row.find('td', class_='gsc_a_c')
+            if citations_cell:
+                citations_link = citations_cell.find('a')
+                if citations_link:
+                    paper_info['citations'] = citations_link.get_text(strip=True)
+                else:
+                    paper_info['citations'] = '0'
+            
+            # Get year
+            year_cell = row.find('td', class_='gsc_a_y')
+            if year_cell:
+                year_span = year_cell.find('span')
+                if year_span:
+                    paper_info['year'] = year_span.get_text(strip=True)
+        
+        except Exception as e:
+            log_event(logging.WARNING, 'row_parse_failed', f"Error extracting paper info: {e}", error=str(e))
+        
+        return paper_info
+    
+    def parse_paper_details(self, content):
+        """Extract the field table and abstract from a paper detail page"""
+        if self.targeted:
+            content = slice_paper_details(content) or content
+            soup = BeautifulSoup(content, 'html.parser', parse_only=self.details_strainer)
+        else:
+            soup = BeautifulSoup(content, 'html.parser')
+        
+        details = {}
+        
+        # Find the details table with id 'gsc_oci_table'
+        details_table = soup.find('div', {'id': 'gsc_oci_table'})
+        if details_table:
+            # Look for div elements with class 'gs_scl' which contain field-value pairs
+            rows = details_table.find_all('div', class_='gs_scl')
+            
+            for row in rows:
+                field_div = row.find('div', class_='gsc_oci_field')
+                value_div = row.find('div', class_='gsc_oci_value')
+                
+                if field_div and value_div:
+                    field = field_div.get_text(strip=True)
+                    cited_by = value_div.find('a') if field == 'Total citations' else None
+                    # Keep the chart's labels and counts out of "Cited by N"
+                    value = (cited_by or value_div).get_text(strip=True)
+                    details[field] = value
+            
+            graph = details_table.find('div', id='gsc_oci_graph_bars')
+            if graph:
+                details['citation_years'], details['citation_counts'] = citation_histogram(
+                    [label.get_text(strip=True) for label in graph.find_all('span', class_='gsc_oci_g_t')],
+                    [(bar.get('href', ''), bar.get_text(strip=True)) for bar in graph.find_all('a', class_='gsc_oci_g_a')])
+        
+        # Look for abstract or description in a div with id 'gsc_oci_descr'
+        description_div = soup.find('div', {'id': 'gsc_oci_descr'})
+        if description_div:
+            details['abstract'] = description_div.get_text(strip=True)
+        
+        return details
+
+
+def _class_xpath(tag, class_name):
+    """XPath step matching tag elements whose class attribute contains class_name as a token"""
+    return f'{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+
+
+class LxmlBackend:
+    """libxml2-backed parser producing the same records as SoupBackend, several times faster"""
+
+    name = 'lxml'
+    
+    def __init__(self, targeted=True):
+        if lxml_html is None:
+            raise ImportError("The lxml parser backend requires lxml (pip install lxml)")
+        # In targeted mode list and detail pages are cut down to the rows or
+        # details table before libxml2 builds a tree
+        self.targeted = targeted
+        # Scholar serves UTF-8; pinning it skips libxml2's encoding guesswork
+        self.html_parser = lxml_html.HTMLParser(encoding='utf-8')
+        self.find_profile_header = lxml_etree.XPath('(//' + _class_xpath('h3', 'gs_rt') + ')[1]')
+        self.find_author_links = lxml_etree.XPath('.//' + _class_xpath('h4', 'gs_rt2'))
+        self.find_paper_rows = lxml_etree.XPath('//' + _class_xpath('tr', 'gsc_a_tr'))
+        self.find_title_cell = lxml_etree.XPath('(.//' + _class_xpath('td', 'gsc_a_t') + ')[1]')
+        self.find_gray_divs = lxml_etree.XPath('.//' + _class_xpath('div', 'gs_gray'))
+        self.find_citations_cell = lxml_etree.XPath('(.//' + _class_xpath('td', 'gsc_a_c') + ')[1]')
+        self.find_year_cell = lxml_etree.XPath('(.//' + _class_xpath('td', 'gsc_a_y') + ')[1]')
+        self.find_first_link = lxml_etree.XPath('(.//a)[1]')
+        self.find_first_span = lxml_etree.XPath('(.//span)[1]')
+        self.find_details_table = lxml_etree.XPath('(//div[@id="gsc_oci_table"])[1]')
+        self.find_detail_rows = lxml_etree.XPath('.//' + _class_xpath('div', 'gs_scl'))
+        self.find_field_div = lxml_etree.XPath('(.//' + _class_xpath('div', 'gsc_oci_field') + ')[1]')
+        self.find_value_div = lxml_etree.XPath('(.//' + _class_xpath('div', 'gsc_oci_value') + ')[1]')
+        self.find_description_div = lxml_etree.XPath('(//div[@id="gsc_oci_descr"])[1]')
+        self.find_graph = lxml_etree.XPath('(.//div[@id="gsc_oci_graph_bars"])[1]')
+        self.find_graph_labels = lxml_etree.XPath('.//' + _class_xpath('span', 'gsc_oci_g_t'))
+        self.find_graph_bars = lxml_etree.XPath('.//' + _class_xpath('a', 'gsc_oci_g_a'))
+        # Same strings BeautifulSoup's get_text() sees: no comments, scripts or styles
+        self.find_text = lxml_etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+    
+    def _document(self, content):
+        if not content or not content.strip():
+            return None
+        return lxml_html.document_fromstring(content, parser=self.html_parser)
+    
+    def _text(self, element, strip=True):
+        """Equivalent of BeautifulSoup's get_text(strip=True)"""
+        if strip:
+            return ''.join(part.strip() for part in self.find_text(element))
+        return ''.join(self.find_text(element))
+    
+    def _first(self, xpath, element):
+        found = xpath(element)
+        return found[0] if found else None
+    
+    def parse_profile_search(self, content, base_url):
+        """Extract profile links from a search results page"""
+        profiles = []
+        document = self._document(content)
+        if document is None:
+            return profiles
+        
+        profile_header = self._first(self.find_profile_header, document)
+        if profile_header is not None and 'User profiles for' in self._text(profile_header, strip=False):
+            table = next(profile_header.itersiblings('table'), None)
+            if table is not None:
+                for h4 in self.find_author_links(table):
+                    link = self._first(self.find_first_link, h4)
+                    if link is not None and '/citations?user=' in link.get('href', ''):
+                        profile_name = self._text(link)
+                        parent_div = h4.getparent()
+                        profiles.append({
+                            'name': profile_name,
+                            'url': urljoin(base_url, link.get('href')),
+                            'info': self._text(parent_div) if parent_div is not None else profile_name
+                        })
+        
+        return profiles
+    
+    def parse_profile_page(self, content, base_url):
+        """Extract the papers listed on one publications list page"""
+        if self.targeted:
+            content = slice_list_rows(content) or content
+        document = self._document(content)
+        if document is None:
+            return []
+        return [self.extract_paper_info(row, base_url) for row in self.find_paper_rows(document)]
+    
+    def extract_paper_info(self, row, base_url):
+        """Extract basic paper information from a profile row"""
+        paper_info = {}
+        
+        try:
+            title_cell = self._first(self.find_title_cell, row)
+            if title_cell is not None:
+                title_link = self._first(self.find_first_link, title_cell)
+                if title_link is not None:
+                    paper_info['title'] = self._text(title_link)
+                    detail_href = title_link.get('href', '')
+                    if detail_href:
+                        paper_info['detail_url'] = urljoin(base_url, detail_href)
+                
+                gray_divs = self.find_gray_divs(title_cell)
+                if len(gray_divs) >= 1:
+                    paper_info['authors'] = self._text(gray_divs[0])
+                if len(gray_divs) >= 2:
+                    paper_info['venue'] = self._text(gray_divs[1])
+            
+            citations_cell = self._first(self.find_citations_cell, row)
+            if citations_cell is not None:
+                citations_link = self._first(self.find_first_link, citations_cell)
+                if citations_link is not None:
+                    paper_info['citations'] = self._text(citations_link)
+                else:
+                    paper_info['citations'] = '0'
+            
+            year_cell = self._first(self.find_year_cell, row)
+            if year_cell is not None:
+                year_span = self._first(self.find_first_span, year_cell)
+                if year_span is not None:
+                    paper_info['year'] = self._text(year_span)
+        
+        except Exception as e:
+            log_event(logging.WARNING, 'row_parse_failed', f"Error extracting paper info: {e}", error=str(e))
+        
+        return paper_info
+    
+    def parse_paper_details(self, content):
+        """Extract the field table and abstract from a paper detail page"""
+        details = {}
+        if self.targeted:
+            content = slice_paper_details(content) or content
+        document = self._document(content)
+        if document is None:
+            return details
+        
+        details_table = self._first(self.find_details_table, document)
+        if details_table is not None:
+            for row in self.find_detail_rows(details_table):
+                field_div = self._first(self.find_field_div, row)
+                value_div = self._first(self.find_value_div, row)
+                
+                if field_div is not None and value_div is not None:
+                    field = self._text(field_div)
+                    cited_by = self._first(self.find_first_link, value_div) if field == 'Total citations' else None
+                    # Keep the chart's labels and counts out of "Cited by N"
+                    details[field] = self._text(value_div if cited_by is None else cited_by)
+            
+            graph = self._first(self.find_graph, details_table)
+            if graph is not None:
+                details['citation_years'], details['citation_counts'] = citation_histogram(
+                    [self._text(label) for label in self.find_graph_labels(graph)],
+                    [(bar.get('href', ''), self._text(bar)) for bar in self.find_graph_bars(graph)])
+        
+        description_div = self._first(self.find_description_div, document)
+        if description_div is not None:
+            details['abstract'] = self._text(description_div)
+        
+        return details
+
+
+PARSER_BACKENDS = {
+    'bs4': SoupBackend,
+    'lxml': LxmlBackend,
+}
+
+
+def get_parser_backend(name='auto', targeted=True):
+    """Create an HTML parser backend by name; 'auto' picks lxml when it is installed"""
+    if name == 'auto':
+        name = 'lxml' if lxml_html is not None else 'bs4'
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {name!r}, choose from: auto, {', '.join(PARSER_BACKENDS)}")
+    return PARSER_BACKENDS[name](targeted=targeted)
+
+
+_process_backend = None  # Parser backend of a ProcessParsePool worker process
+
+
+def _init_parse_process(backend_name, targeted):
+    global _process_backend
+    _process_backend = get_parser_backend(backend_name, targeted)
+
+
+def _parse_in_process(method, content, *args):
+    return getattr(_process_backend, method)(content, *args)
+
+
+class ProcessParsePool:
+    """Worker processes that parse raw pages into plain records, outside the fetching process's GIL
+
+    Fetch threads or coroutines hand over response bytes and wait for the
+    parsed dicts, so parsing scales with the number of processes while the
+    number of requests in flight is set separately.
+    """
+
+    def __init__(self, workers, backend_name, targeted=True):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_process,
+                                            initargs=(backend_name, targeted))
+    
+    def submit(self, method, content, *args):
+        """Run a backend parse method (e.g. 'parse_paper_details') in a worker process, returning a Future"""
+        return self.executor.submit(_parse_in_process, method, content, *args)
+    
+    def close(self):
+        self.executor.shutdown()
+
+
+def citation_for_view(detail_url):
+    """Extract the stable citation_for_view id ("user:paper") from a paper detail URL"""
+    if not detail_url:
+        return None
+    return dict(parse_qsl(urlparse(detail_url).query)).get('citation_for_view')
+
+
+def has_details(paper):
+    """Whether a paper holds anything from its detail page, rather than just its list row"""
+    return any(key not in LIST_FIELDS and key != 'detail_url' for key in paper)
+
+
+def load_known_papers(path):
+    """Load a previous --output file (JSON or JSON Lines) as an ordered {citation_for_view: paper} mapping"""
+    if not os.path.exists(path):
+        log_event(logging.INFO, 'no_previous_results', f"No previous results at {path}, doing a full sync", path=path)
+        return {}
+    if path.endswith(JSONL_SUFFIXES):
+        papers = read_jsonl(path)
+    else:
+        with open(path) as f:
+            papers = json.load(f)
+        if isinstance(papers, dict):
+            # A batch run writes {author: papers}; known_papers_for narrows them down per profile
+            papers = [paper for author_papers in papers.values() for paper in author_papers]
+    known = {}
+    for paper in papers:
+        paper_id = citation_for_view(paper.get('detail_url'))
+        if paper_id:
+            known[paper_id] = Paper.from_dict(paper)
+    return known
+
+
+class ProfilePaging:
+    """Paging decisions for one profile's publications list, shared by both engines
+
+    The engines only fetch and parse: params() is the query for the next list
+    page, or None once paging is over, and accept() yields the papers of a
+    parsed page that fall within max_papers and year_limit. With known_papers
+    (citation_for_view ids, or {id: paper} from a previous sync), paging ends
+    after the first page holding a known paper; reuse() and remaining_known()
+    then serve the unchanged papers from that sync.
+    
+    A previous sync may have stopped early (a lower max_papers, a narrower
+    year_limit, a deadline), so the known papers can run out before this one
+    is done. resume() then goes on paging after the page where paging stopped,
+    skipping the papers already served.
+    """
+
+    def __init__(self, parser, profile_url, max_papers=None, year_limit=None, known_papers=None):
+        self.parser = parser
+        self.max_papers = max_papers
+        self.year_limit = year_limit
+        self.known_papers = known_papers
+        self.user_id = parser.profile_user_id(profile_url)
+        self.url = f"{parser.base_url}/citations"
+        self.count = 0  # Papers yielded so far
+        self.start_index = 0
+        self.done = False
+        self.seen_ids = set()  # Papers yielded so far, by citation_for_view id
+        self.fetched = 0  # Papers whose details could not be reused
+        self.resume_index = None  # Next list row after the page where the known papers were reached
+        self.resumed = False
+        
+        log_event(logging.INFO, 'profile_paging', f"Fetching papers from profile: {profile_url}", url=profile_url)
+        if year_limit:
+            log_event(logging.INFO, 'year_limit_set',
+                      f"Year limit set to: {year_limit} (will stop at papers from {year_limit-1} or earlier)",
+                      year_limit=year_limit)
+        if not self.user_id:
+            log_event(logging.ERROR, 'no_user_id', "Could not extract user ID from profile URL", url=profile_url)
+            self.done = True
+    
+    def full(self):
+        return bool(self.max_papers) and self.count >= self.max_papers
+    
+    def params(self):
+        """Query for the next list page, or None once paging is over"""
+        if self.done:
+            return None
+        if self.parser.deadline_passed():
+            log_event(logging.INFO, 'deadline_paging', "Run deadline reached, no more list pages",
+                      user_id=self.user_id)
+            self.done = True
+            return None
+        return self.parser.profile_list_params(self.user_id, self.start_index)
+    
+    def failed(self, params, error):
+        """Dead-letter a list page that could not be fetched or parsed, which ends paging"""
+        log_event(logging.ERROR, 'list_page_failed', f"Error fetching papers: {error}",
+                  user_id=self.user_id, start=self.start_index, error=str(error))
+        self.parser.dead_letters.add('list_works', self.url, error, params=params)
+        self.done = True
+    
+    def accept(self, page_papers):
+        """Yield the papers of a parsed list page that are within the limits, then decide whether paging goes on"""
+        self.done = True
+        if not page_papers:
+            return
+        
+        reached_known = False
+        for paper_info in page_papers:
+            if self.full():
+                break
+            
+            if paper_info:
+                if self.parser.reached_year_limit(paper_info, self.year_limit):
+                    return
+                paper_id = citation_for_view(paper_info.get('detail_url'))
+                if self.resumed and paper_id in self.seen_ids:
+                    continue
+                if self.known_papers and not self.resumed and paper_id in self.known_papers:
+                    reached_known = True
+                self.seen_ids.add(paper_id)
+                self.count += 1
+                yield paper_info
+        
+        if reached_known:
+            # Sorted by pubdate, so the papers past this page should be known from last time
+            log_event(logging.INFO, 'reached_known_papers', "Reached papers from the previous sync, stopping",
+                      user_id=self.user_id)
+            if len(page_papers) == LIST_PAGE_SIZE:
+                self.resume_index = self.start_index + len(page_papers)
+            return
+        
+        self.start_index += len(page_papers)
+        # Less than a full page means we're done
+        if len(page_papers) == LIST_PAGE_SIZE:
+            self.done = self.parser.reached_max_papers(self.max_papers, self.count, self.user_id)
+    
+    def reuse(self, paper):
+        """The stored record of an unchanged known paper, or None if its details must be fetched"""
+        previous = None
+        if self.known_papers:
+            previous = self.parser.reuse_known_paper(paper, self.known_papers, self.parser.cache)
+        if previous is None:
+            self.fetched += 1
+        return previous
+    
+    def remaining_known(self):
+        """Yield the known papers past the point where paging stopped, up to max_papers"""
+        if not self.known_papers:
+            return
+        for paper in self.parser.remaining_known_papers(self.known_papers, self.seen_ids, self.year_limit):
+            if self.full():
+                return
+            self.seen_ids.add(citation_for_view(paper.get('detail_url')))
+            self.count += 1
+            yield paper
+    
+    def resume(self):
+        """Page on past the known papers if they ran out before max_papers; False when there is nothing to do"""
+        if self.resume_index is None or self.full() or self.parser.deadline_passed():
+            return False
+        log_event(logging.INFO, 'resume_paging',
+                  f"Known papers ran out after {self.count} papers, paging on from row {self.resume_index}",
+                  user_id=self.user_id, papers=self.count, start=self.resume_index)
+        self.start_index = self.resume_index
+        self.resume_index = None
+        self.resumed = True
+        self.done = False
+        return True
+    
+    def report(self):
+        """Log what an incremental sync had to fetch"""
+        if self.known_papers:
+            log_event(logging.INFO, 'incremental_sync',
+                      f"Incremental sync: fetched details for {self.fetched} new or changed papers",
+                      fetched=self.fetched)
+
+
+class PaperFeed:
+    """Writes the papers of a run to a sink as they arrive
+
+    Papers whose detail fetch is waiting in the dead letters are held back and
+    written by write_held() after the end-of-run retry. on_write is called
+    with the running total and each paper written.
+    """
+
+    def __init__(self, sink, dead_letters, on_write=None):
+        self.sink = sink
+        self.dead_letters = dead_letters
+        self.on_write = on_write
+        self.total = 0
+        self.written = {}  # Papers written per author of a batch
+        self.held = []  # (author, paper) waiting for the retry
+        self.lock = threading.Lock()  # Batch authors write from their own threads
+    
+    def add(self, paper, author=None):
+        with self.lock:
+            if self.dead_letters.holds(paper):
+                self.held.append((author, paper))
+            else:
+                self._write(paper, author)
+    
+    def write_held(self):
+        """Write the held papers, with whatever details the retry recovered"""
+        with self.lock:
+            for author, paper in self.held:
+                self._write(paper, author)
+            self.held = []
+    
+    def _write(self, paper, author):
+        # Caller holds self.lock
+        self.sink.write(paper)
+        self.total += 1
+        self.written[author] = self.written.get(author, 0) + 1
+        if self.on_write:
+            self.on_write(self.total, paper)
+
+
+class ScholarPageParser:
+    """HTML parsing shared by the threaded and asyncio engines"""
+
+    def __init__(self, parser_backend='auto', targeted_parse=True, parse_workers=0, metrics=None, quiet=False):
+        self.backend = get_parser_backend(parser_backend, targeted_parse)
+        self.metrics = metrics  # Optional RequestMetrics recording request and parse times
+        self.quiet = quiet  # Skip rendering the per-paper research summary
+        self.deadline = None  # Deadline of the current run, if it has one
+        self.deadline_reached = False  # Whether the last run ended at its deadline
         self.base_url = "https://scholar.google.com"
         self.lock = threading.Lock()  # For thread-safe operations
+        # With parse_workers, pages are parsed in that many worker processes
+        self.parse_pool = ProcessParsePool(parse_workers, self.backend.name, targeted_parse) if parse_workers else None
+    
+    def run_parser(self, method, content, *args):
+        """Call a parser backend method in this thread, or in the process pool when there is one"""
+        started = time.monotonic()
+        if self.parse_pool:
+            result = self.parse_pool.submit(method, content, *args).result()
+        else:
+            result = getattr(self.backend, method)(content, *args)
+        self.observe_parse(method, started)
+        return result
+    
+    async def run_parser_async(self, method, content, *args):
+        """Call a parser backend method without blocking the event loop on the process pool"""
+        started = time.monotonic()
+        if self.parse_pool:
+            result = await asyncio.wrap_future(self.parse_pool.submit(method, content, *args))
+        else:
+            result = getattr(self.backend, method)(content, *args)
+        self.observe_parse(method, started)
+        return result
+    
+    def observe_parse(self, method, started):
+        """Record the time since started as parse time for the method's endpoint"""
+        if self.metrics:
+            self.metrics.observe_parse(PARSE_METHOD_ENDPOINTS.get(method, 'other'), time.monotonic() - started)
+    
+    def set_deadline(self, seconds):
+        """Start a run deadline seconds from now, or clear it with None at the end of the run"""
+        self.deadline_reached = self.deadline is not None and self.deadline.expired()
+        self.deadline = Deadline(seconds) if seconds else None
+        return self.deadline
+    
+    def deadline_passed(self):
+        return self.deadline is not None and self.deadline.expired()
+    
+    def drop_unfinished(self, pending):
+        """Cancel the detail fetches still in flight at the deadline and return the finished papers in order"""
+        finished = [future.result() for future in pending if future.done() and not future.cancelled()]
+        for future in pending:
+            future.cancel()
+        log_event(logging.WARNING, 'deadline_reached',
+                  f"Run deadline reached: keeping {len(finished)} finished papers, "
+                  f"dropping {len(pending) - len(finished)} still in flight",
+                  finished=len(finished), dropped=len(pending) - len(finished))
+        pending.clear()
+        return finished
+    
+    def close_parse_pool(self):
+        """Stop the parse worker processes"""
+        if self.parse_pool:
+            self.parse_pool.close()
+            self.parse_pool = None
+    
+    def profile_search_params(self, author_name):
+        """Build the query for the author profile search"""
+        # Search for the author using the URL format we tested
+        return {
+            'hl': 'en',
+            'as_sdt': '0,5',
+            'q': author_name,
+            'btnG': ''
+        }
+    
+    def parse_profile_search(self, content):
+        """Extract profile links from a search results page"""
+        return self.run_parser('parse_profile_search', content, self.base_url)
+    
+    def profile_user_id(self, profile_url):
+        """Extract the user ID from a profile URL"""
+        parsed_url = urlparse(profile_url)
+        query_params = parse_qs(parsed_url.query)
+        return query_params.get('user', [''])[0]
+    
+    def profile_from_url(self, author):
+        """Use a profile URL given in place of an author name as the chosen profile, skipping the search"""
+        if '/citations?' not in author or 'user=' not in author:
+            return None
+        url = urljoin(self.base_url, author)
+        return {'name': self.profile_user_id(url), 'url': url, 'info': ''}
+    
+    def known_papers_for(self, profile_url, known_papers=None, sync_from_store=False):
+        """The known_papers of one profile: its papers in the store, or previous results narrowed to its user id"""
+        user_id = self.profile_user_id(profile_url)
+        if sync_from_store and known_papers is None and self.store:
+            known_papers = self.store.known_papers(user_id)
+            log_event(logging.INFO, 'store_known_papers', f"Store holds {len(known_papers)} papers of this profile",
+                      user_id=user_id, papers=len(known_papers))
+            return known_papers
+        if known_papers:
+            return {paper_id: paper for paper_id, paper in known_papers.items() if paper_id.split(':')[0] == user_id}
+        return known_papers
+    
+    def profile_list_params(self, user_id, start_index):
+        """Build the query for one page of the author's publications list"""
+        return {
+            'user': user_id,
+            'hl': 'en',
+            'view_op': 'list_works',
+            'sortby': 'pubdate',
+            'cstart': str(start_index),
+            'pagesize': str(LIST_PAGE_SIZE)
+        }
+    
+    def reached_max_papers(self, max_papers, count, user_id):
+        """Check whether enough papers were listed, which ends paging before another list page is requested"""
+        if max_papers and count >= max_papers:
+            log_event(logging.INFO, 'max_papers_reached', f"Reached {max_papers} papers, no more list pages",
+                      user_id=user_id, max_papers=max_papers)
+            return True
+        return False
+    
+    def parse_profile_page(self, content):
+        """Extract the papers listed on one publications list page as Paper records"""
+        return [Paper.from_dict(info) for info in self.run_parser('parse_profile_page', content, self.base_url)]
+    
+    def reached_year_limit(self, paper_info, year_limit):
+        """Check whether a paper is older than the year limit, which ends the listing"""
+        # Check year limit if specified
+        if year_limit and paper_info.get('year'):
+            try:
+                paper_year = int(paper_info['year'])
+                if paper_year < year_limit:
+                    log_event(logging.INFO, 'year_limit_reached',
+                              f"Reached year limit: found paper from {paper_year} (limit: {year_limit})",
+                              year=paper_year, year_limit=year_limit)
+                    return True
+            except (ValueError, TypeError):
+                # If year parsing fails, continue with the paper
+                pass
+        return False
+    
+    def reuse_known_paper(self, paper_info, known_papers, cache=None):
+        """Return the stored record for an unchanged paper, or None if its details must be fetched
+
+        For a changed paper the detail page is also dropped from cache, so the
+        refetch does not merge the same stale page back in.
+        """
+        previous = known_papers.get(citation_for_view(paper_info.get('detail_url')))
+        if previous is None or not has_details(previous):
+            # Papers whose details failed last time are known, but fetched again
+            return None
+        # A new citation count or corrected title/venue means the detail page changed too
+        if any(previous.get(field) != paper_info.get(field) for field in LIST_FIELDS):
+            if cache and 'detail_url' in paper_info:
+                cache.invalidate(paper_info['detail_url'])
+            return None
+        return previous
+    
+    def remaining_known_papers(self, known_papers, seen_ids, year_limit=None):
+        """Yield stored papers the incremental sync did not page through, in stored order"""
+        for paper_id, paper in known_papers.items():
+            if paper_id in seen_ids:
+                continue
+            if year_limit and paper.get('year'):
+                try:
+                    if int(paper['year']) < year_limit:
+                        continue
+                except (ValueError, TypeError):
+                    pass
+            yield paper
+    
+    def extract_paper_info(self, row, user_id):
+        """Extract basic paper information from a BeautifulSoup profile row"""
+        return Paper.from_dict(SoupBackend(targeted=False).extract_paper_info(row, self.base_url))
+    
+    def search_failed(self, author_name, search_url, params, error):
+        """Log and dead-letter a profile search that failed after its retries"""
+        log_event(logging.ERROR, 'profile_search_failed', f"Error searching for profiles: {error}",
+                  author=author_name, error=str(error))
+        self.dead_letters.add('search', search_url, error, params=params)
+        return []
+    
+    def detail_failed(self, paper_detail_url, error, paper=None, index=None):
+        """Log and dead-letter a detail page that failed after its retries, with its paper and position"""
+        log_event(logging.ERROR, 'paper_detail_failed', f"Error getting paper details: {error}",
+                  url=paper_detail_url, error=str(error))
+        self.dead_letters.add('view_citation', paper_detail_url, error, paper=paper, index=index)
+        return {}
+    
+    def checkpointed_paper(self, paper, index):
+        """Fill in a paper from the checkpoint journal; False if its details still have to be fetched"""
+        if not self.checkpoint:
+            return False
+        details = self.checkpoint.lookup(paper)
+        if details is None:
+            return False
+        paper.update(details)
+        if self.store:
+            self.store.save_paper(paper, index)
+        return True
+    
+    def merge_details(self, paper, index, details):
+        """Merge fetched details into a paper, then journal and store it"""
+        paper.update(details)
+        if self.checkpoint:
+            self.checkpoint.record(paper, details)
+        if self.store:
+            self.store.save_paper(paper, index, detailed=bool(details))
+    
+    def parse_paper_details(self, content):
+        """Extract the field table and abstract from a paper detail page"""
+        return self.run_parser('parse_paper_details', content)
+    
+    def announce_analysis(self, author_name, num_workers, year_limit):
+        """Log the header for an analyze_author_research run"""
+        lines = [f"=== Analyzing research for: {author_name} ===",
+                 f"Using {num_workers} workers for parallel processing"]
+        if year_limit:
+            lines.append(f"Year limit: {year_limit} (will stop at papers from {year_limit-1} or earlier)")
+        log_event(logging.INFO, 'analysis_started', '\n'.join(lines) + '\n',
+                  author=author_name, num_workers=num_workers, year_limit=year_limit)
+    
+    def choose_profile(self, profiles, profile_index):
+        """List the found profiles and pick the one to analyze"""
+        lines = [f"Found {len(profiles)} profile(s):"]
+        for i, profile in enumerate(profiles):
+            lines.append(f"{i+1}. {profile['name']}")
+            lines.append(f"   Info: {profile['info']}")
+            lines.append(f"   URL: {profile['url']}")
+        log_event(logging.INFO, 'profiles_found', '\n'.join(lines) + '\n',
+                  profiles=[{'name': profile['name'], 'url': profile['url']} for profile in profiles])
+        
+        # Use the specified profile or the first one
+        if profile_index >= len(profiles):
+            log_event(logging.WARNING, 'profile_index_out_of_range',
+                      f"Profile index {profile_index} out of range, using profile 0", profile_index=profile_index)
+            profile_index = 0
+            
+        chosen_profile = profiles[profile_index]
+        log_event(logging.INFO, 'profile_chosen', f"Using profile: {chosen_profile['name']}",
+                  name=chosen_profile['name'], url=chosen_profile['url'])
+        return chosen_profile
+    
+    def report_authors(self, results, sink=None):
+        """One line per author of a batch run"""
+        if self.quiet:
+            return
+        print("\n=== Batch Summary ===")
+        for author, papers in results.items():
+            print(f"{author}: {papers if sink is not None else len(papers)} papers")
+    
+    def create_concurrency(self, num_workers, adaptive, max_workers):
+        """Create the AIMD controller for an adaptive run, or None for a fixed worker count"""
+        if not adaptive:
+            return None
+        controller = AdaptiveConcurrency(initial=num_workers, maximum=max_workers)
+        log_event(logging.INFO, 'adaptive_concurrency_started',
+                  f"Adaptive concurrency: starting at {controller.limit} workers, up to {controller.maximum}",
+                  window=controller.limit, maximum=controller.maximum)
+        return controller
+    
+    def announce_dead_letter_retry(self, letters):
+        """Log the start of the end-of-run retry of failed detail pages"""
+        log_event(logging.INFO, 'dead_letter_retry', f"\nRetrying {len(letters)} papers whose details failed",
+                  papers=len(letters))
+    
+    def report_dead_letters(self):
+        """Log the requests that are still failing at the end of a run"""
+        records = self.dead_letters.records()
+        if not records:
+            return
+        lines = []
+        # Requests the deadline stopped were never retried, so they are listed apart
+        for heading, group in (("failed after retrying", [r for r in records if r['failure'] != 'deadline']),
+                               ("stopped by the run deadline", [r for r in records if r['failure'] == 'deadline'])):
+            if group:
+                lines.append(f"{len(group)} requests {heading}:")
+            for record in group:
+                lines.append(f"   {record['endpoint']} ({record['failure']}): {record.get('title') or record['url']}: "
+                             f"{record['error']}")
+        log_event(logging.WARNING, 'dead_letters', '\n'.join(lines), letters=records)
+    
+    def report_concurrency(self, controller):
+        """Log where the adaptive window ended up and why"""
+        if controller is None:
+            return
+        metrics = controller.metrics()
+        lines = [f"Adaptive concurrency: final window {metrics['window']} "
+                 f"({metrics['increases']} increases, {metrics['decreases']} decreases)"]
+        for decision in metrics['decisions']:
+            if decision['action'] == 'decrease':
+                lines.append(f"   Cut to {decision['window']} workers: {decision['reason']}")
+        log_event(logging.INFO, 'adaptive_concurrency_finished', '\n'.join(lines), window=metrics['window'],
+                  increases=metrics['increases'], decreases=metrics['decreases'])
+    
+    def report_connection_pool(self, stats):
+        """Log how well the keep-alive connections were reused"""
+        log_event(logging.INFO, 'connection_pool',
+                  f"Connection pool: {stats['requests']} requests over {stats['connections_opened']} connections "
+                  f"({stats['connections_reused']} reused)", **stats)
+    
+    def connection_stats(self):
+        """Connection reuse statistics to report at the end of a run, if the engine keeps any"""
+        return None
+    
+    def open_feed(self, sink, summarise=False):
+        """A PaperFeed writing to sink, printing each paper's summary when summarise is set"""
+        if summarise:
+            self.print_summary_header()
+        return PaperFeed(sink, self.dead_letters, self.print_paper_summary if summarise else None)
+    
+    def end_run(self, controller):
+        """Clear the run's concurrency controller and deadline, and report how the run went"""
+        self.use_concurrency(None)
+        self.set_deadline(None)
+        self.report_concurrency(controller)
+        stats = self.connection_stats()
+        if stats:
+            self.report_connection_pool(stats)
+        self.report_dead_letters()
+    
+    def abandon_analysis(self):
+        """End a run whose profile could not be found"""
+        self.report_dead_letters()
+        self.set_deadline(None)
+        return []
+    
+    def finish_analysis(self, controller, papers=None, feed=None):
+        """End an analyze_author_research run after its retry: the papers, or the number the feed wrote"""
+        if feed is not None:
+            feed.write_held()
+            found = feed.total
+        else:
+            found = len(papers)
+        log_event(logging.INFO, 'analysis_finished', f"\nFound {found} papers", papers=found)
+        self.end_run(controller)
+        if feed is not None:
+            return feed.total
+        
+        # Display results
+        self.print_research_summary(papers)
+        return papers
+    
+    def finish_batch(self, authors, results, controller, feed=None):
+        """End an analyze_authors run after its retry: {author: papers}, or papers written, in input order"""
+        if feed is not None:
+            feed.write_held()
+            results = {author: feed.written.get(author, 0) for author in authors}
+        else:
+            results = {author: results[author] for author in authors}
+        self.end_run(controller)
+        self.report_authors(results, feed)
+        return results
+    
+    def print_summary_header(self):
+        """Print the heading of the research summary"""
+        if not self.quiet:
+            print(f"\n=== Research Summary ===")
+    
+    def print_research_summary(self, detailed_papers):
+        """Display the enriched papers"""
+        if self.quiet:
+            return
+        self.print_summary_header()
+        for i, paper in enumerate(detailed_papers, 1):
+            self.print_paper_summary(i, paper)
+    
+    def print_paper_summary(self, i, paper):
+        """Display one enriched paper"""
+        if self.quiet:
+            return
+        print(f"\n--- Paper {i}: {paper['title'][:80]}{'...' if len(paper['title']) > 80 else ''} ---")
+        print(f"Year: {paper.get('year', 'Unknown')}")
+        print(f"Citations: {paper.get('citations', '0')}")
+        print(f"Authors: {paper.get('authors', 'Unknown')}")
+        print(f"Venue: {paper.get('venue', 'Unknown')}")
+        
+        if 'abstract' in paper:
+            print(f"Abstract: {paper['abstract'][:500]}{'...' if len(paper['abstract']) > 500 else ''}")
+        elif 'Description' in paper:
+            print(f"Description: {paper['Description'][:500]}{'...' if len(paper['Description']) > 500 else ''}")
+        
+        # Show some other details we extracted
+        if 'Journal' in paper:
+            print(f"Journal: {paper['Journal']}")
+        if 'Volume' in paper:
+            print(f"Volume: {paper['Volume']}")
+        if 'Pages' in paper:
+            print(f"Pages: {paper['Pages']}")
+        if 'Publisher' in paper:
+            print(f"Publisher: {paper['Publisher']}")
+        if 'Total citations' in paper:
+            print(f"Scholar Citations: {paper['Total citations']}")
+
+
+class ScholarProfileParser(ScholarPageParser):
+    def __init__(self, pool_size=4, rate_limiter=None, parser_backend='auto', targeted_parse=True, cache=None,
+                 checkpoint=None, store=None, parse_workers=0, archive=None, metrics=None, quiet=False,
+                 retry_policy=None, timeout=DEFAULT_TIMEOUT):
+        super().__init__(parser_backend, targeted_parse, parse_workers, metrics, quiet)
+        self.checkpoint = checkpoint  # Optional CheckpointJournal of completed detail fetches
+        self.store = store  # Optional ScholarStore receiving every profile and paper
+        self.dead_letters = DeadLetters()  # Requests that failed after their retries
+        # One pooled transport serves every fetch path so connections are reused
+        # and every request draws from the same rate limiter and cache
+        self.transport = PooledTransport(pool_size, rate_limiter=rate_limiter, cache=cache, archive=archive,
+                                         metrics=metrics, retry_policy=retry_policy, timeout=timeout)
+        self.rate_limiter = self.transport.rate_limiter
+        self.session = self.transport.session
+        self.cache = self.transport.cache
+    
+    def close(self):
+        """Close the HTTP session and any parse worker processes"""
+        self.session.close()
+        self.close_parse_pool()
+    
+    def set_deadline(self, seconds):
+        """Start a run deadline seconds from now, or clear it with None; requests stop at it too"""
+        self.transport.deadline = super().set_deadline(seconds)
+        return self.deadline
+    
+    def use_concurrency(self, controller):
+        """Feed every request's latency and throttling to controller, or stop with None"""
+        self.transport.concurrency = controller
+    
+    def connection_stats(self):
+        return self.transport.stats()
+    
+    def shutdown_executor(self, executor):
+        """Shut down a detail pool, leaving fetches still running behind once the deadline has passed"""
+        if self.deadline_passed():
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            executor.shutdown()
+    
+    def wait_for(self, future):
+        """Wait for a detail fetch until the run deadline; False if the deadline passed first"""
+        if self.deadline is not None:
+            wait_futures([future], timeout=self.deadline.remaining())
+            return future.done()
+        return True
     
     def search_author_profiles(self, author_name):
         """Search for author profiles on Google Scholar"""
-        print(f"Searching for author profiles: {author_name}")
+        log_event(logging.INFO, 'profile_search', f"Searching for author profiles: {author_name}", author=author_name)
         
-        # First, search for the author using the URL format we tested
         search_url = f"{self.base_url}/scholar"
-        params = {
-            'hl': 'en',
-            'as_sdt': '0,5',
-            'q': author_name,
-            'btnG': ''
-        }
+        params = self.profile_search_params(author_name)
         
         try:
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
+            content = self.transport.fetch(search_url, params=params)
+            
+            profiles = self.parse_profile_search(content)
+            if self.store:
+                self.store.save_profiles(profiles)
+            return profiles
+            
+        except Exception as e:
+            return self.search_failed(author_name, search_url, params, e)
+    
+    def find_profile(self, author, profile_index=0):
+        """Resolve an author name, or a profile URL used as is, to the profile to analyze"""
+        profile = self.profile_from_url(author)
+        if profile:
+            return profile
+        profiles = self.search_author_profiles(author)
+        if not profiles:
+            log_event(logging.WARNING, 'no_profiles', "No profiles found!", author=author)
+            return None
+        return self.choose_profile(profiles, profile_index)
+    
+    def get_profile_papers(self, profile_url, max_papers=None, year_limit=None, on_paper=None):
+        """Get all papers from a scholar profile
+
+        on_paper is called with each paper as soon as it is parsed, before the
+        next list page is requested.
+        """
+        papers = []
+        for paper_info in self.iter_profile_papers(profile_url, max_papers, year_limit):
+            papers.append(paper_info)
+            if on_paper:
+                on_paper(paper_info)
+        return papers
+    
+    def iter_profile_papers(self, profile_url, max_papers=None, year_limit=None, stop_at_known=None):
+        """Lazily yield papers from a scholar profile, one list page at a time
+
+        The next list page is only requested once the consumer has taken every
+        paper from the current one. With stop_at_known (citation_for_view ids of
+        papers from a previous sync), paging ends after the first page that
+        contains an already-known paper.
+        """
+        yield from self.iter_list_pages(ProfilePaging(self, profile_url, max_papers, year_limit, stop_at_known))
+    
+    def iter_list_pages(self, paging):
+        """Fetch and parse the list pages paging asks for, yielding the papers it accepts"""
+        while True:
+            papers_params = paging.params()
+            if papers_params is None:
+                return
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            try:
+                content = self.transport.fetch(paging.url, params=papers_params)
+                
+                page_papers = self.parse_profile_page(content)
+            except Exception as e:
+                paging.failed(papers_params, e)
+                return
             
-            # Look for the specific "User profiles for X" section
-            profiles = []
+            yield from paging.accept(page_papers)
+    
+    def iter_paged_papers(self, paging):
+        """The listed papers, then in incremental mode the known papers past the last page and any rows after them"""
+        yield from self.iter_list_pages(paging)
+        yield from paging.remaining_known()
+        if paging.resume():
+            yield from self.iter_list_pages(paging)
+    
+    def get_paper_details(self, paper_detail_url, paper=None, index=None):
+        """Get detailed information for a specific paper
+
+        On failure the request is dead-lettered, together with the paper and
+        its position when given, and an empty dict is returned.
+        """
+        try:
+            log_event(logging.INFO, 'paper_detail_fetch', f"Fetching details for: {paper_detail_url}",
+                      url=paper_detail_url)
             
-            # Find the table with profile information
-            # Based on the HTML, look for h3 with "User profiles for" followed by a table
-            profile_header = soup.find('h3', class_='gs_rt')
-            if profile_header and 'User profiles for' in profile_header.get_text():
-                # Find the table that follows this header
-                table = profile_header.find_next_sibling('table')
-                if table:
-                    # Look for h4 elements with author links
-                    author_links = table.find_all('h4', class_='gs_rt2')
-                    
-                    for h4 in author_links:
-                        link = h4.find('a')
-                        if link and '/citations?user=' in link.get('href', ''):
-                            profile_url = urljoin(self.base_url, link['href'])
-                            profile_name = link.get_text(strip=True)
-                            
-                            # Extract additional info (email, citations)
-                            parent_div = h4.parent
-                            profile_info = parent_div.get_text(strip=True) if parent_div else profile_name
-                            
-                            profiles.append({
-                                'name': profile_name,
-                                'url': profile_url,
-                                'info': profile_info
-                            })
+            content = self.transport.fetch(paper_detail_url)
             
-            return profiles
+            return self.parse_paper_details(content)
             
         except Exception as e:
-            print(f"Error searching for profiles: {e}")
-            return []
+            return self.detail_failed(paper_detail_url, e, paper, index)
     
-    def get_profile_papers(self, profile_url, max_papers=None, year_limit=None):
-        """Get all papers from a scholar profile"""
-        print(f"Fetching papers from profile: {profile_url}")
-        if year_limit:
-            print(f"Year limit set to: {year_limit} (will stop at papers from {year_limit-1} or earlier)")
+    def process_paper(self, paper, index, controller=None):
+        """Merge a paper's detail page into its record"""
+        if self.checkpointed_paper(paper, index):
+            return paper
         
-        # Extract user ID from URL
-        parsed_url = urlparse(profile_url)
-        query_params = parse_qs(parsed_url.query)
-        user_id = query_params.get('user', [''])[0]
+        if controller:
+            controller.acquire()
+        try:
+            # Get detailed information
+            if 'detail_url' in paper:
+                self.merge_details(paper, index, self.get_paper_details(paper['detail_url'], paper, index))
+        except Exception as e:
+            log_event(logging.ERROR, 'paper_failed', f"Error processing paper {index + 1}: {e}",
+                      index=index, error=str(e))
+        finally:
+            if controller:
+                controller.release()
+        return paper
+    
+    def iter_detailed_papers(self, profile_url, max_papers=None, year_limit=None, num_workers=4,
+                             buffer_size=None, controller=None, known_papers=None, executor=None):
+        """Yield papers enriched with their detail pages, in profile order
+
+        At most buffer_size papers (default 4 per worker) are in flight or waiting
+        to be consumed. Once the buffer is full, paging and new detail fetches
+        pause until the consumer takes the oldest paper, so memory stays flat
+        however long the profile is.
+        
+        known_papers ({citation_for_view: paper} from a previous sync) turns on
+        incremental mode: paging stops at the first known paper, only new or
+        changed papers are fetched, and the remaining stored papers follow.
+        Detail fetches run on executor when one is shared across profiles,
+        otherwise on a pool of num_workers threads owned by this call.
+        """
+        pool_workers = controller.maximum if controller else num_workers
+        buffer_size = buffer_size or 4 * pool_workers
         
-        if not user_id:
-            print("Could not extract user ID from profile URL")
+        own_executor = executor is None
+        if own_executor:
+            # Make sure each worker can hold its own keep-alive connection
+            self.transport.ensure_pool_size(pool_workers)
+            executor = ThreadPoolExecutor(max_workers=pool_workers)
+        
+        paging = ProfilePaging(self, profile_url, max_papers, year_limit, known_papers)
+        pending = deque()
+        index = 0
+        try:
+            for paper in self.iter_paged_papers(paging):
+                previous = paging.reuse(paper)
+                if previous is not None:
+                    future = Future()
+                    future.set_result(previous)
+                else:
+                    future = executor.submit(self.process_paper, paper, index, controller)
+                pending.append(future)
+                index += 1
+                if len(pending) >= buffer_size:
+                    if not self.wait_for(pending[0]):
+                        break
+                    yield pending.popleft().result()
+            
+            while pending and self.wait_for(pending[0]):
+                yield pending.popleft().result()
+            if pending:
+                # The run deadline passed: keep what has finished and drop the rest
+                for paper in self.drop_unfinished(pending):
+                    yield paper
+        finally:
+            # The consumer stopped early; drop fetches that have not started
+            for future in pending:
+                future.cancel()
+            if own_executor:
+                self.shutdown_executor(executor)
+        paging.report()
+    
+    def retry_dead_letters(self, num_workers=4):
+        """Fetch the detail pages that failed during the run once more, filling in their papers
+
+        Returns the papers whose details arrived this time. Papers that fail
+        again go back into self.dead_letters, next to the failed searches and
+        list pages, which are reported rather than retried.
+        """
+        if self.deadline_passed():
             return []
+        letters = self.dead_letters.take_papers()
+        if not letters:
+            return []
+        self.announce_dead_letter_retry(letters)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            papers = list(executor.map(lambda letter: self.process_paper(letter['paper'], letter['index']), letters))
+        return [paper for paper in papers if not self.dead_letters.holds(paper)]
+    
+    def analyze_author_research(self, author_name, max_papers=20, profile_index=0, num_workers=4, year_limit=None,
+                                adaptive=False, max_workers=DEFAULT_MAX_WORKERS, known_papers=None, sink=None,
+                                sync_from_store=False, deadline=None):
+        """Complete workflow: find author, get papers, analyze research
+
+        With adaptive=True, num_workers is only the starting concurrency; an AIMD
+        controller then moves it between 1 and max_workers based on latency and
+        throttling responses. known_papers enables an incremental sync against
+        a previous run (see iter_detailed_papers).
+
+        With a sink (e.g. a JsonlWriter), each paper is written and summarised as
+        soon as it is ready instead of being collected, and the number of papers
+        written is returned in place of the list. sync_from_store takes
+        known_papers from the attached ScholarStore once the profile is chosen.
+
+        deadline (seconds) bounds the whole run: once it passes, paging stops,
+        detail fetches still in flight are dropped and the papers finished by
+        then are returned.
+        """
+        self.announce_analysis(author_name, num_workers, year_limit)
+        self.set_deadline(deadline)
         
-        # Build the URL to get the author's publications list
-        papers_url = f"{self.base_url}/citations"
-        papers_params = {
-            'user': user_id,
-            'hl': 'en',
-            'view_op': 'list_works',
-            'sortby': 'pubdate',
-            'cstart': '0',
-            'pagesize': '100'
-        }
+        # Step 1: Find author profiles
+        chosen_profile = self.find_profile(author_name, profile_index)
+        if not chosen_profile:
+            return self.abandon_analysis()
+        known_papers = self.known_papers_for(chosen_profile['url'], known_papers, sync_from_store)
         
-        papers = []
-        start_index = 0
+        controller = self.create_concurrency(num_workers, adaptive, max_workers)
+        self.use_concurrency(controller)
+        
+        log_event(logging.INFO, 'detail_fetch_started',
+                  f"Fetching detailed information using {num_workers} parallel workers while paging the profile...",
+                  num_workers=num_workers)
+        
+        # Steps 2 and 3 are pipelined: each paper's details are requested as soon
+        # as its row is parsed, while this thread keeps paging through the list
+        papers = self.iter_detailed_papers(chosen_profile['url'], max_papers, year_limit,
+                                           num_workers, controller=controller, known_papers=known_papers)
+        if sink is not None:
+            feed = self.open_feed(sink, summarise=True)
+            for paper in papers:
+                feed.add(paper)
+            self.retry_dead_letters(num_workers)
+            return self.finish_analysis(controller, feed=feed)
+        
+        detailed_papers = list(papers)
+        # Papers are updated in place, so the list picks up recovered details
+        self.retry_dead_letters(num_workers)
+        return self.finish_analysis(controller, papers=detailed_papers)
+    
+    def collect_author_papers(self, author, max_papers, profile_index, num_workers, year_limit, controller,
+                              executor, known_papers=None, feed=None, sync_from_store=False):
+        """One author of a batch: its papers, or with a PaperFeed the number of papers written so far"""
+        profile = self.find_profile(author, profile_index)
+        if not profile:
+            return 0 if feed is not None else []
+        known_papers = self.known_papers_for(profile['url'], known_papers, sync_from_store)
+        papers = self.iter_detailed_papers(profile['url'], max_papers, year_limit, num_workers,
+                                           controller=controller, known_papers=known_papers, executor=executor)
+        if feed is None:
+            return list(papers)
+        for paper in papers:
+            feed.add(paper, author)
+        return feed.written.get(author, 0)
+    
+    def analyze_authors(self, authors, max_papers=20, profile_index=0, num_workers=4, year_limit=None,
+                        adaptive=False, max_workers=DEFAULT_MAX_WORKERS, known_papers=None, sink=None,
+                        sync_from_store=False, author_workers=DEFAULT_AUTHOR_WORKERS, deadline=None):
+        """Batch workflow: run many authors (names or profile URLs) through one shared pipeline
+
+        Up to author_workers authors are searched and paged at once, and the
+        detail fetches of all of them share one pool of num_workers threads, the
+        connection pool and the rate limiter, so requests for different authors
+        interleave. Returns {author: papers} in input order, or with a sink
+        {author: number of papers written}. A deadline bounds the whole batch
+        as in analyze_author_research.
+        """
+        log_event(logging.INFO, 'batch_started',
+                  f"Analyzing {len(authors)} authors, {author_workers} at a time, with {num_workers} shared workers",
+                  authors=len(authors), author_workers=author_workers, num_workers=num_workers)
+        self.set_deadline(deadline)
+        
+        controller = self.create_concurrency(num_workers, adaptive, max_workers)
+        self.use_concurrency(controller)
+        pool_workers = controller.maximum if controller else num_workers
+        # Detail workers and the author threads paging their profiles each hold a connection
+        self.transport.ensure_pool_size(pool_workers + author_workers)
+        
+        feed = self.open_feed(sink) if sink is not None else None
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=pool_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=author_workers) as author_executor:
+                futures = {author_executor.submit(self.collect_author_papers, author, max_papers, profile_index,
+                                                  num_workers, year_limit, controller, executor, known_papers,
+                                                  feed, sync_from_store): author
+                           for author in authors}
+                for future in as_completed(futures):
+                    author = futures[future]
+                    try:
+                        results[author] = future.result()
+                    except Exception as e:
+                        log_event(logging.ERROR, 'author_failed', f"Error analyzing {author}: {e}",
+                                  author=author, error=str(e))
+                        results[author] = []
+        finally:
+            self.shutdown_executor(executor)
         
+        self.retry_dead_letters(num_workers)
+        return self.finish_batch(authors, results, controller, feed)
+
+
+class AsyncScholarProfileParser(ScholarPageParser, RequestPipeline):
+    """asyncio counterpart of ScholarProfileParser running on a single event loop
+
+    Use it as an async context manager, or pass in an existing aiohttp.ClientSession
+    to share connections with the surrounding service. A supplied session carries no
+    request_trace_config(), so its DNS and connect times stay inside the time to
+    first byte.
+    """
+
+    def __init__(self, max_connections=100, session=None, rate_limiter=None, parser_backend='auto',
+                 targeted_parse=True, cache=None, checkpoint=None, store=None, parse_workers=0, archive=None,
+                 metrics=None, quiet=False, retry_policy=None, timeout=DEFAULT_TIMEOUT):
+        super().__init__(parser_backend, targeted_parse, parse_workers, metrics, quiet)
+        if aiohttp is None:
+            raise ImportError("AsyncScholarProfileParser requires aiohttp (pip install aiohttp)")
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.concurrency = None  # AdaptiveConcurrency fed with latency and throttle signals
+        self.cache = cache  # Optional ResponseCache consulted before the network
+        self.archive = archive  # Optional ResponseArchive to record into or replay from
+        self.checkpoint = checkpoint  # Optional CheckpointJournal of completed detail fetches
+        self.store = store  # Optional ScholarStore receiving every profile and paper
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout  # (connect, read) seconds for each request
+        self.dead_letters = DeadLetters()  # Requests that failed after their retries
+        self.session = session
+        self._owns_session = session is None
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self):
+        """Create the keep-alive client session if one was not supplied"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections)
+            self.session = aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector,
+                                                 trace_configs=[request_trace_config()])
+            self._owns_session = True
+    
+    async def close(self):
+        """Close the client session if this parser created it, and any parse worker processes"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.close_parse_pool()
+    
+    def use_concurrency(self, controller):
+        """Feed every request's latency and throttling to controller, or stop with None"""
+        self.concurrency = controller
+    
+    async def fetch(self, url, params=None):
+        """GET a page and return its body bytes, serving fresh copies from the cache"""
+        content = self.stored_response(url, params)
+        if content is None:
+            content = await self.get_content(url, params)
+            self.keep_response(url, params, content)
+        return content
+    
+    async def get_content(self, url, params=None):
+        """GET a page over the network, retrying throttled and transient failures under the retry policy"""
+        attempt = 0
         while True:
-            papers_params['cstart'] = str(start_index)
-            
             try:
-                response = self.session.get(papers_url, params=papers_params)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all paper rows in the table
-                paper_rows = soup.find_all('tr', class_='gsc_a_tr')
-                
-                if not paper_rows:
-                    break
-                    
-                for row in paper_rows:
-                    if max_papers and len(papers) >= max_papers:
-                        return papers
-                        
-                    paper_info = self.extract_paper_info(row, user_id)
-                    if paper_info:
-                        # Check year limit if specified
-                        if year_limit and paper_info.get('year'):
-                            try:
-                                paper_year = int(paper_info['year'])
-                                if paper_year < year_limit:
-                                    print(f"Reached year limit: found paper from {paper_year} (limit: {year_limit})")
-                                    return papers
-                            except (ValueError, TypeError):
-                                # If year parsing fails, continue with the paper
-                                pass
-                        
-                        papers.append(paper_info)
-                
-                # Check if there are more papers to fetch
-                start_index += len(paper_rows)
-                if len(paper_rows) < 100:  # Less than full page means we're done
-                    break
-                    
+                return await self.get(url, params)
             except Exception as e:
-                print(f"Error fetching papers: {e}")
-                break
+                delay = self.retry_delay(url, params, attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+    
+    async def get(self, url, params=None):
+        """Issue one GET request and return the body of a successful response"""
+        if self.session is None:
+            await self.open()
+        queued = time.monotonic()
+        await self.rate_limiter.acquire_async(self.deadline)
+        self.check_deadline(url)
+        connect_timeout, read_timeout = self.timeout
+        total = self.deadline.remaining() if self.deadline is not None else None
+        timeout = aiohttp.ClientTimeout(total=total, sock_connect=connect_timeout, sock_read=read_timeout)
+        trace = RequestTrace()
+        started = time.monotonic()
+        try:
+            async with self.session.get(url, params=params, timeout=timeout, trace_request_ctx=trace) as response:
+                first_byte = time.monotonic()
+                content = await response.read()
+        except Exception as e:
+            self.request_failed(url, params, e)
+            raise
         
-        return papers
+        self.response_received(url, params, response, response.status, content, queued, started, first_byte, trace)
+        response.raise_for_status()
+        return content
     
-    def extract_paper_info(self, row, user_id):
-        """Extract basic paper information from a profile row"""
-        paper_info = {}
+    async def search_author_profiles(self, author_name):
+        """Search for author profiles on Google Scholar"""
+        log_event(logging.INFO, 'profile_search', f"Searching for author profiles: {author_name}", author=author_name)
         
+        search_url = f"{self.base_url}/scholar"
+        params = self.profile_search_params(author_name)
         try:
-            # Get title and link to detailed page
-            title_cell = row.find('td', class_='gsc_a_t')
-            if title_cell:
-                title_link = title_cell.find('a')
-                if title_link:
-                    paper_info['title'] = title_link.get_text(strip=True)
-                    # Build full URL for paper details
-                    detail_href = title_link.get('href', '')
-                    if detail_href:
-                        paper_info['detail_url'] = urljoin(self.base_url, detail_href)
-                
-                # Get authors and publication info
-                gray_divs = title_cell.find_all('div', class_='gs_gray')
-                if len(gray_divs) >= 1:
-                    paper_info['authors'] = gray_divs[0].get_text(strip=True)
-                if len(gray_divs) >= 2:
-                    paper_info['venue'] = gray_divs[1].get_text(strip=True)
-            
-            # Get citations count
-            citations_cell = row.find('td', class_='gsc_a_c')
-            if citations_cell:
-                citations_link = citations_cell.find('a')
-                if citations_link:
-                    paper_info['citations'] = citations_link.get_text(strip=True)
-                else:
-                    paper_info['citations'] = '0'
-            
-            # Get year
-            year_cell = row.find('td', class_='gsc_a_y')
-            if year_cell:
-                year_span = year_cell.find('span')
-                if year_span:
-                    paper_info['year'] = year_span.get_text(strip=True)
-        
+            content = await self.fetch(search_url, params)
+            profiles = await self.run_parser_async('parse_profile_search', content, self.base_url)
+            if self.store:
+                self.store.save_profiles(profiles)
+            return profiles
         except Exception as e:
-            print(f"Error extracting paper info: {e}")
-        
-        return paper_info
+            return self.search_failed(author_name, search_url, params, e)
+    
+    async def find_profile(self, author, profile_index=0):
+        """Resolve an author name, or a profile URL used as is, to the profile to analyze"""
+        profile = self.profile_from_url(author)
+        if profile:
+            return profile
+        profiles = await self.search_author_profiles(author)
+        if not profiles:
+            log_event(logging.WARNING, 'no_profiles', "No profiles found!", author=author)
+            return None
+        return self.choose_profile(profiles, profile_index)
+    
+    async def get_profile_papers(self, profile_url, max_papers=None, year_limit=None, on_paper=None):
+        """Get all papers from a scholar profile
+
+        on_paper is called with each paper as soon as it is parsed, before the
+        next list page is requested.
+        """
+        papers = []
+        async for paper_info in self.iter_profile_papers(profile_url, max_papers, year_limit):
+            papers.append(paper_info)
+            if on_paper:
+                on_paper(paper_info)
+        return papers
+    
+    async def iter_profile_papers(self, profile_url, max_papers=None, year_limit=None, stop_at_known=None):
+        """Lazily yield papers from a scholar profile, one list page at a time
+
+        With stop_at_known, paging ends after the first page containing a known paper.
+        """
+        async for paper_info in self.iter_list_pages(ProfilePaging(self, profile_url, max_papers, year_limit,
+                                                                   stop_at_known)):
+            yield paper_info
+    
+    async def iter_list_pages(self, paging):
+        """Fetch and parse the list pages paging asks for, yielding the papers it accepts"""
+        while True:
+            papers_params = paging.params()
+            if papers_params is None:
+                return
+            try:
+                content = await self.fetch(paging.url, papers_params)
+                page_papers = [Paper.from_dict(info) for info in
+                               await self.run_parser_async('parse_profile_page', content, self.base_url)]
+            except Exception as e:
+                paging.failed(papers_params, e)
+                return
+            for paper_info in paging.accept(page_papers):
+                yield paper_info
     
-    def get_paper_details(self, paper_detail_url):
-        """Get detailed information for a specific paper"""
+    async def iter_paged_papers(self, paging):
+        """The listed papers, then in incremental mode the known papers past the last page and any rows after them"""
+        async for paper in self.iter_list_pages(paging):
+            yield paper
+        for paper in paging.remaining_known():
+            yield paper
+        if paging.resume():
+            async for paper in self.iter_list_pages(paging):
+                yield paper
+    
+    async def get_paper_details(self, paper_detail_url, paper=None, index=None):
+        """Get detailed information for a specific paper, dead-lettering it on failure"""
         try:
-            with self.lock:
-                print(f"Fetching details for: {paper_detail_url}")
-            
-            # Create a new session for this thread to avoid conflicts
-            local_session = requests.Session()
-            local_session.headers.update(self.session.headers)
-            
-            response = local_session.get(paper_detail_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {}
-            
-            # Find the details table with id 'gsc_oci_table'
-            details_table = soup.find('div', {'id': 'gsc_oci_table'})
-            if details_table:
-                # Look for div elements with class 'gs_scl' which contain field-value pairs
-                rows = details_table.find_all('div', class_='gs_scl')
-                
-                for row in rows:
-                    field_div = row.find('div', class_='gsc_oci_field')
-                    value_div = row.find('div', class_='gsc_oci_value')
-                    
-                    if field_div and value_div:
-                        field = field_div.get_text(strip=True)
-                        value = value_div.get_text(strip=True)
-                        details[field] = value
+            log_event(logging.INFO, 'paper_detail_fetch', f"Fetching details for: {paper_detail_url}",
+                      url=paper_detail_url)
             
-            # Look for abstract or description in a div with id 'gsc_oci_descr'
-            description_div = soup.find('div', {'id': 'gsc_oci_descr'})
-            if description_div:
-                details['abstract'] = description_div.get_text(strip=True)
-            
-            # Add a small delay to be respectful to the server
-            time.sleep(0.5)
-            
-            return details
+            content = await self.fetch(paper_detail_url)
+            return await self.run_parser_async('parse_paper_details', content)
             
         except Exception as e:
-            with self.lock:
-                print(f"Error getting paper details: {e}")
-            return {}
+            return self.detail_failed(paper_detail_url, e, paper, index)
     
-    def analyze_author_research(self, author_name, max_papers=20, profile_index=0, num_workers=4, year_limit=None):
-        """Complete workflow: find author, get papers, analyze research"""
-        print(f"=== Analyzing research for: {author_name} ===")
-        print(f"Using {num_workers} workers for parallel processing")
-        if year_limit:
-            print(f"Year limit: {year_limit} (will stop at papers from {year_limit-1} or earlier)")
-        print()
+    async def process_paper(self, paper, index, gate):
+        """Merge a paper's detail page into its record
+
+        gate is either an asyncio.Semaphore or an AdaptiveConcurrency controller.
+        """
+        if self.checkpointed_paper(paper, index):
+            return paper
         
-        # Step 1: Find author profiles
-        profiles = self.search_author_profiles(author_name)
+        if isinstance(gate, AdaptiveConcurrency):
+            await gate.acquire_async()
+        else:
+            await gate.acquire()
+        try:
+            if 'detail_url' in paper:
+                self.merge_details(paper, index, await self.get_paper_details(paper['detail_url'], paper, index))
+        except Exception as e:
+            log_event(logging.ERROR, 'paper_failed', f"Error processing paper {index + 1}: {e}",
+                      index=index, error=str(e))
+        finally:
+            gate.release()
+        return paper
+    
+    async def iter_detailed_papers(self, profile_url, max_papers=None, year_limit=None, num_workers=4,
+                                   buffer_size=None, controller=None, known_papers=None, gate=None):
+        """Yield papers enriched with their detail pages, in profile order
+
+        At most buffer_size papers (default 4 per worker) are in flight or waiting
+        to be consumed; paging pauses until the consumer takes the oldest one.
+        known_papers turns on incremental mode as in ScholarProfileParser. A gate
+        shared across profiles caps their detail fetches together.
+        """
+        gate = gate or controller or asyncio.Semaphore(num_workers)
+        buffer_size = buffer_size or 4 * (controller.maximum if controller else num_workers)
         
-        if not profiles:
-            print("No profiles found!")
+        paging = ProfilePaging(self, profile_url, max_papers, year_limit, known_papers)
+        pending = deque()
+        index = 0
+        try:
+            async for paper in self.iter_paged_papers(paging):
+                previous = paging.reuse(paper)
+                if previous is not None:
+                    task = asyncio.get_running_loop().create_future()
+                    task.set_result(previous)
+                else:
+                    task = asyncio.create_task(self.process_paper(paper, index, gate))
+                pending.append(task)
+                index += 1
+                if len(pending) >= buffer_size:
+                    if not await self.wait_for(pending[0]):
+                        break
+                    yield pending.popleft().result()
+            
+            while pending and await self.wait_for(pending[0]):
+                yield pending.popleft().result()
+            if pending:
+                # The run deadline passed: keep what has finished and cancel the rest
+                for paper in self.drop_unfinished(pending):
+                    yield paper
+        finally:
+            # The consumer stopped early; drop fetches that are still running
+            for task in pending:
+                task.cancel()
+        paging.report()
+    
+    async def wait_for(self, task):
+        """Wait for a detail fetch until the run deadline; False if the deadline passed first"""
+        if self.deadline is not None:
+            await asyncio.wait({task}, timeout=self.deadline.remaining())
+        else:
+            await asyncio.wait({task})
+        return task.done()
+    
+    async def retry_dead_letters(self, num_workers=4):
+        """Fetch the detail pages that failed during the run once more, as in ScholarProfileParser"""
+        if self.deadline_passed():
             return []
+        letters = self.dead_letters.take_papers()
+        if not letters:
+            return []
+        self.announce_dead_letter_retry(letters)
+        gate = asyncio.Semaphore(num_workers)
+        papers = await asyncio.gather(*(self.process_paper(letter['paper'], letter['index'], gate)
+                                        for letter in letters))
+        return [paper for paper in papers if not self.dead_letters.holds(paper)]
+    
+    async def analyze_author_research(self, author_name, max_papers=20, profile_index=0, num_workers=4, year_limit=None,
+                                      adaptive=False, max_workers=DEFAULT_MAX_WORKERS, known_papers=None, sink=None,
+                                      sync_from_store=False, deadline=None):
+        """Complete workflow: find author, get papers, analyze research
+
+        num_workers caps the number of in-flight detail fetches; each one is a
+        coroutine rather than a thread, so hundreds are cheap. With adaptive=True
+        it is only the starting point for the AIMD controller. With a sink, papers
+        are written as they arrive and their count is returned. sync_from_store
+        and deadline work as in ScholarProfileParser; at the deadline, fetches
+        still in flight are cancelled.
+        """
+        self.announce_analysis(author_name, num_workers, year_limit)
+        self.set_deadline(deadline)
         
-        print(f"Found {len(profiles)} profile(s):")
-        for i, profile in enumerate(profiles):
-            print(f"{i+1}. {profile['name']}")
-            print(f"   Info: {profile['info']}")
-            print(f"   URL: {profile['url']}")
-        print()
-        
-        # Use the specified profile or the first one
-        if profile_index >= len(profiles):
-            print(f"Profile index {profile_index} out of range, using profile 0")
-            profile_index = 0
-            
-        chosen_profile = profiles[profile_index]
-        print(f"Using profile: {chosen_profile['name']}")
+        chosen_profile = await self.find_profile(author_name, profile_index)
+        if not chosen_profile:
+            return self.abandon_analysis()
+        known_papers = self.known_papers_for(chosen_profile['url'], known_papers, sync_from_store)
         
-        # Step 2: Get papers from profile
-        papers = self.get_profile_papers(chosen_profile['url'], max_papers, year_limit)
+        controller = self.create_concurrency(num_workers, adaptive, max_workers)
+        self.use_concurrency(controller)
         
-        print(f"\nFound {len(papers)} papers")
-        print(f"Fetching detailed information using {num_workers} parallel workers...")
+        log_event(logging.INFO, 'detail_fetch_started',
+                  f"Fetching detailed information using {num_workers} concurrent tasks while paging the profile...",
+                  num_workers=num_workers)
         
-        # Step 3: Get detailed info for each paper using parallel processing
-        papers_to_process = papers[:max_papers]
+        # Detail fetches start as soon as each row is parsed and run while the
+        # remaining list pages are still being requested
+        papers = self.iter_detailed_papers(chosen_profile['url'], max_papers, year_limit, num_workers,
+                                           controller=controller, known_papers=known_papers)
+        if sink is not None:
+            feed = self.open_feed(sink, summarise=True)
+            async for paper in papers:
+                feed.add(paper)
+            await self.retry_dead_letters(num_workers)
+            return self.finish_analysis(controller, feed=feed)
         
-        def process_paper(paper_data):
-            paper, index = paper_data
-            try:
-                # Get detailed information
-                if 'detail_url' in paper:
-                    details = self.get_paper_details(paper['detail_url'])
-                    paper.update(details)
-                
-                return paper, index
-            except Exception as e:
-                with self.lock:
-                    print(f"Error processing paper {index + 1}: {e}")
-                return paper, index
+        detailed_papers = [paper async for paper in papers]
+        await self.retry_dead_letters(num_workers)
+        return self.finish_analysis(controller, papers=detailed_papers)
+    
+    async def collect_author_papers(self, author, max_papers, profile_index, num_workers, year_limit, gate,
+                                    known_papers=None, feed=None, sync_from_store=False):
+        """One author of a batch: its papers, or with a PaperFeed the number of papers written so far"""
+        profile = await self.find_profile(author, profile_index)
+        if not profile:
+            return 0 if feed is not None else []
+        known_papers = self.known_papers_for(profile['url'], known_papers, sync_from_store)
+        papers = self.iter_detailed_papers(profile['url'], max_papers, year_limit, num_workers,
+                                           known_papers=known_papers, gate=gate)
+        if feed is None:
+            return [paper async for paper in papers]
+        async for paper in papers:
+            feed.add(paper, author)
+        return feed.written.get(author, 0)
+    
+    async def analyze_authors(self, authors, max_papers=20, profile_index=0, num_workers=4, year_limit=None,
+                              adaptive=False, max_workers=DEFAULT_MAX_WORKERS, known_papers=None, sink=None,
+                              sync_from_store=False, author_workers=DEFAULT_AUTHOR_WORKERS, deadline=None):
+        """Batch workflow as in ScholarProfileParser, with every author's tasks on one event loop
+
+        A single gate caps the detail fetches of all authors together at
+        num_workers (or the adaptive limit).
+        """
+        log_event(logging.INFO, 'batch_started',
+                  f"Analyzing {len(authors)} authors, {author_workers} at a time, with {num_workers} shared tasks",
+                  authors=len(authors), author_workers=author_workers, num_workers=num_workers)
+        self.set_deadline(deadline)
         
-        # Create list of (paper, index) tuples for processing
-        paper_data = [(paper, i) for i, paper in enumerate(papers_to_process)]
+        controller = self.create_concurrency(num_workers, adaptive, max_workers)
+        self.use_concurrency(controller)
+        gate = controller or asyncio.Semaphore(num_workers)
+        author_slots = asyncio.Semaphore(author_workers)
+        feed = self.open_feed(sink) if sink is not None else None
         
-        # Process papers in parallel
-        detailed_papers = [None] * len(papers_to_process)
+        async def run_author(author):
+            async with author_slots:
+                try:
+                    return await self.collect_author_papers(author, max_papers, profile_index, num_workers,
+                                                            year_limit, gate, known_papers, feed, sync_from_store)
+                except Exception as e:
+                    log_event(logging.ERROR, 'author_failed', f"Error analyzing {author}: {e}",
+                              author=author, error=str(e))
+                    return []
         
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            results = executor.map(process_paper, paper_data)
-            
-            for paper, index in results:
-                detailed_papers[index] = paper
+        papers = await asyncio.gather(*(run_author(author) for author in authors))
         
-        # Display results
-        print(f"\n=== Research Summary ===")
-        for i, paper in enumerate(detailed_papers, 1):
-            print(f"\n--- Paper {i}: {paper['title'][:80]}{'...' if len(paper['title']) > 80 else ''} ---")
-            print(f"Year: {paper.get('year', 'Unknown')}")
-            print(f"Citations: {paper.get('citations', '0')}")
-            print(f"Authors: {paper.get('authors', 'Unknown')}")
-            print(f"Venue: {paper.get('venue', 'Unknown')}")
-            
-            if 'abstract' in paper:
-                print(f"Abstract: {paper['abstract'][:500]}{'...' if len(paper['abstract']) > 500 else ''}")
-            elif 'Description' in paper:
-                print(f"Description: {paper['Description'][:500]}{'...' if len(paper['Description']) > 500 else ''}")
-            
-            # Show some other details we extracted
-            if 'Journal' in paper:
-                print(f"Journal: {paper['Journal']}")
-            if 'Volume' in paper:
-                print(f"Volume: {paper['Volume']}")
-            if 'Pages' in paper:
-                print(f"Pages: {paper['Pages']}")
-            if 'Publisher' in paper:
-                print(f"Publisher: {paper['Publisher']}")
-            if 'Total citations' in paper:
-                print(f"Scholar Citations: {paper['Total citations']}")
-        
-        return detailed_papers
+        await self.retry_dead_letters(num_workers)
+        return self.finish_batch(authors, dict(zip(authors, papers)), controller, feed)
+
+
+def read_authors(path):
+    """Author names or profile URLs from a file or stdin, skipping blank lines, # comments and repeats"""
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    return list(dict.fromkeys(line.strip() for line in lines if line.strip() and not line.lstrip().startswith('#')))
+
 
 def main():
     parser = argparse.ArgumentParser(description='Parse Google Scholar author profiles')
-    parser.add_argument('author', help='Author name to search for')
+    parser.add_argument('author', nargs='?', help='Author name to search for, or a profile URL')
+    parser.add_argument('--authors-file', metavar='FILE', help='Batch mode: read author names or profile URLs, one per line, from FILE (- for stdin)')
+    parser.add_argument('--author-workers', type=int, default=DEFAULT_AUTHOR_WORKERS, help=f'Authors searched and paged at the same time in batch mode (default: {DEFAULT_AUTHOR_WORKERS})')
     parser.add_argument('--max-papers', type=int, default=20, help='Maximum number of papers to analyze')
     parser.add_argument('--profile-index', type=int, default=0, help='Which profile to use (0 for first, 1 for second, etc.)')
     parser.add_argument('--num-workers', type=int, default=4, help='Number of parallel workers for fetching paper details')
+    parser.add_argument('--adaptive', action='store_true', help='Adjust the number of workers automatically, backing off on throttling (--num-workers is the starting point)')
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS, help=f'Upper bound for --adaptive concurrency (default: {DEFAULT_MAX_WORKERS})')
     parser.add_argument('--year-limit', type=int, help='Stop collecting papers when reaching this year (e.g., --year-limit 2020 stops at 2019 papers)')
-    parser.add_argument('--output', help='Output file to save results (JSON format)')
+    parser.add_argument('--output', help='Output file to save results (JSON format, an {author: papers} object in batch mode; .jsonl, .jsonl.gz or .jsonl.zst streams one paper per line as it is fetched; .parquet, .arrow or .feather writes a typed columnar table)')
+    parser.add_argument('--fsync-every', type=int, default=DEFAULT_FSYNC_EVERY, help=f'Papers between fsyncs of a streamed .jsonl output, 0 to sync only at the end (default: {DEFAULT_FSYNC_EVERY})')
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE, help=f'Papers per row group of a Parquet or Arrow output (default: {DEFAULT_ROW_GROUP_SIZE})')
+    parser.add_argument('--incremental', nargs='?', const='', metavar='PREVIOUS', help='Only fetch papers that are new or changed since a previous JSON result (defaults to the --store database, then the --output file)')
+    parser.add_argument('--store', metavar='PATH', help='Upsert every profile and paper into an indexed SQLite database')
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_RATE_LIMIT, help=f'Maximum requests per second across all workers, 0 for unlimited (default: {DEFAULT_RATE_LIMIT})')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help=f'Requests allowed back to back before the rate limit applies (default: {DEFAULT_BURST})')
+    parser.add_argument('--html-parser', choices=['auto'] + list(PARSER_BACKENDS), default='auto', help='HTML parser backend; auto uses lxml when installed and falls back to BeautifulSoup')
+    parser.add_argument('--parse-workers', type=int, default=0, help='Parse pages in this many worker processes instead of the fetching threads, so parsing scales past one core (default: 0)')
+    parser.add_argument('--full-parse', action='store_true', help='Parse whole pages instead of only the paper rows and details table')
+    parser.add_argument('--checkpoint', help='Journal each completed paper to this file (default: OUTPUT.journal.jsonl when --output is set)')
+    parser.add_argument('--resume', action='store_true', help='Skip papers already recorded in the checkpoint journal of an interrupted run')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, help=f'Cache responses in an SQLite file so repeat runs skip the network (default path: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024), help='Evict least recently used cached responses beyond this size')
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument('--record', metavar='DIR', help='Save every raw response to DIR for later --replay')
+    archive_group.add_argument('--replay', metavar='DIR', help='Serve responses recorded with --record from DIR instead of the network')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads', help='Run with a thread pool or a single asyncio event loop (async requires aiohttp)')
+    parser.add_argument('--deadline', type=parse_duration, metavar='DURATION', help='Stop the whole run after DURATION (e.g. 90s, 10m, 1h), keeping the papers finished by then')
+    parser.add_argument('--connect-timeout', type=float, default=DEFAULT_CONNECT_TIMEOUT, help=f'Seconds to wait for a connection before a request fails (default: {DEFAULT_CONNECT_TIMEOUT:g})')
+    parser.add_argument('--read-timeout', type=float, default=DEFAULT_READ_TIMEOUT, help=f'Seconds to wait for each read of a response before it fails (default: {DEFAULT_READ_TIMEOUT:g})')
+    parser.add_argument('--max-retries', type=int, metavar='N', help='Retries per request on throttling or transient errors (default: ' + ', '.join(f'{endpoint} {budget}' for endpoint, budget in DEFAULT_RETRY_BUDGETS.items()) + ')')
+    parser.add_argument('--dead-letters', metavar='FILE', help='Write requests that still failed after retrying, and the end-of-run retry, to FILE as JSON Lines')
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default='info', help='Least severe progress messages to show (default: info; debug shows everything)')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text', help='Write progress messages to stderr as plain text or as one JSON event per line')
+    parser.add_argument('--quiet', action='store_true', help='Skip the per-paper research summary; progress messages follow --log-level')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT', help='Serve per-endpoint request and parse metrics in Prometheus text format on http://127.0.0.1:PORT/metrics during the run')
+    parser.add_argument('--metrics-json', metavar='FILE', help='Dump per-endpoint request and parse metrics as JSON to FILE periodically and at the end of the run')
+    parser.add_argument('--metrics-interval', type=float, default=DEFAULT_METRICS_INTERVAL, help=f'Seconds between --metrics-json dumps (default: {DEFAULT_METRICS_INTERVAL:g})')
     
     args = parser.parse_args()
     
-    scholar_parser = ScholarProfileParser()
-    papers = scholar_parser.analyze_author_research(args.author, args.max_papers, args.profile_index, args.num_workers, args.year_limit)
+    log_listener = setup_logging(args.log_level, json_format=args.log_format == 'json')
+    
+    if bool(args.author) == bool(args.authors_file):
+        parser.error('give either an author or --authors-file')
+    authors = read_authors(args.authors_file) if args.authors_file else None
+    
+    known_papers = None
+    sync_from_store = args.incremental == '' and bool(args.store)
+    if args.incremental is not None and not sync_from_store:
+        previous_path = args.incremental or args.output
+        if not previous_path:
+            parser.error('--incremental needs a previous results file, --store or --output')
+        if previous_path.endswith(ARROW_SUFFIXES):
+            parser.error('--incremental reads JSON or JSON Lines results, not Parquet or Arrow')
+        known_papers = load_known_papers(previous_path)
+    
+    checkpoint_path = args.checkpoint or (f"{args.output}.journal.jsonl" if args.output else None)
+    if args.resume and not checkpoint_path:
+        parser.error('--resume needs --checkpoint or --output')
+    if checkpoint_path and not args.resume and os.path.exists(checkpoint_path):
+        parser.error(f'{checkpoint_path} holds the journal of an unfinished run: '
+                     'rerun with --resume to continue it, or delete it to start over')
+    checkpoint = CheckpointJournal(checkpoint_path, resume=args.resume) if checkpoint_path else None
+    
+    rate_limiter = RateLimiter(args.rate_limit, args.burst)
+    cache = ResponseCache(args.cache, args.cache_size_mb * 1024 * 1024) if args.cache else None
+    store = ScholarStore(args.store) if args.store else None
+    archive = ResponseArchive(args.replay or args.record, replay=bool(args.replay)) if args.replay or args.record else None
+    timeout = (args.connect_timeout, args.read_timeout)
+    retry_policy = RetryPolicy({endpoint: args.max_retries for endpoint in DEFAULT_RETRY_BUDGETS}
+                               if args.max_retries is not None else None)
+    metrics = RequestMetrics() if args.metrics_port is not None or args.metrics_json else None
+    reporter = MetricsReporter(metrics, args.metrics_port, args.metrics_json, args.metrics_interval) if metrics else None
+    if reporter and reporter.url:
+        print(f"Serving metrics on {reporter.url}")
+    # Opened after load_known_papers so an incremental run can rewrite its own input
+    sink = open_output_sink(args.output, args.fsync_every, args.row_group_size) if args.output else None
+    
+    if args.engine == 'async':
+        async def run_async():
+            async with AsyncScholarProfileParser(max_connections=max(args.num_workers, args.max_workers), rate_limiter=rate_limiter,
+                                                 parser_backend=args.html_parser,
+                                                 targeted_parse=not args.full_parse, cache=cache,
+                                                 checkpoint=checkpoint, store=store,
+                                                 parse_workers=args.parse_workers, archive=archive,
+                                                 metrics=metrics, quiet=args.quiet,
+                                                 retry_policy=retry_policy, timeout=timeout) as async_parser:
+                if authors:
+                    papers = await async_parser.analyze_authors(
+                        authors, args.max_papers, args.profile_index, args.num_workers, args.year_limit,
+                        adaptive=args.adaptive, max_workers=args.max_workers, known_papers=known_papers, sink=sink,
+                        sync_from_store=sync_from_store, author_workers=args.author_workers, deadline=args.deadline)
+                else:
+                    papers = await async_parser.analyze_author_research(
+                        args.author, args.max_papers, args.profile_index, args.num_workers, args.year_limit,
+                        adaptive=args.adaptive, max_workers=args.max_workers, known_papers=known_papers, sink=sink,
+                        sync_from_store=sync_from_store, deadline=args.deadline)
+                return papers, async_parser.dead_letters, async_parser.deadline_reached
+        
+        papers, dead_letters, deadline_reached = asyncio.run(run_async())
+    else:
+        scholar_parser = ScholarProfileParser(pool_size=args.num_workers, rate_limiter=rate_limiter,
+                                              parser_backend=args.html_parser,
+                                              targeted_parse=not args.full_parse, cache=cache,
+                                              checkpoint=checkpoint, store=store, parse_workers=args.parse_workers,
+                                              archive=archive, metrics=metrics, quiet=args.quiet,
+                                              retry_policy=retry_policy, timeout=timeout)
+        if authors:
+            papers = scholar_parser.analyze_authors(
+                authors, args.max_papers, args.profile_index, args.num_workers, args.year_limit,
+                adaptive=args.adaptive, max_workers=args.max_workers, known_papers=known_papers, sink=sink,
+                sync_from_store=sync_from_store, author_workers=args.author_workers, deadline=args.deadline)
+        else:
+            papers = scholar_parser.analyze_author_research(
+                args.author, args.max_papers, args.profile_index, args.num_workers, args.year_limit,
+                adaptive=args.adaptive, max_workers=args.max_workers, known_papers=known_papers, sink=sink,
+                sync_from_store=sync_from_store, deadline=args.deadline)
+        dead_letters = scholar_parser.dead_letters
+        deadline_reached = scholar_parser.deadline_reached
+        scholar_parser.close()
+    
+    if args.dead_letters:
+        dead_letters.write(args.dead_letters)
+        print(f"\n{len(dead_letters)} failed requests written to {args.dead_letters}")
+    
+    if reporter:
+        print(f"\nRequest metrics:\n{metrics.summary()}")
+        reporter.close()
+        if args.metrics_json:
+            print(f"Metrics written to {args.metrics_json}")
+    
+    if cache:
+        stats = cache.stats()
+        print(f"\nResponse cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB)")
+        cache.close()
     
-    if args.output and papers:
+    if archive:
+        if archive.replay:
+            print(f"\nReplayed {archive.replayed} responses from {args.replay} ({archive.missing} not recorded)")
+        else:
+            print(f"\nRecorded {archive.recorded} responses to {args.record}")
+        archive.close()
+    
+    if store:
+        stats = store.stats()
+        print(f"Store: {stats['profiles']} profiles and {stats['papers']} papers in {args.store}")
+        store.close()
+    
+    if sink:
+        sink.close()
+        print(f"\nResults written to {args.output}")
+    elif args.output and papers:
         with open(args.output, 'w') as f:
-            json.dump(papers, f, indent=2)
+            json.dump(papers, f, indent=2, default=json_default)
         print(f"\nResults saved to {args.output}")
+    
+    if checkpoint:
+        # Once every paper has been fetched the journal has served its purpose;
+        # after failures or a deadline it is kept so --resume can pick up the rest
+        checkpoint.close(remove=bool(papers) and not dead_letters and not deadline_reached)
+    
+    # Flush progress messages still waiting in the logging queue
+    log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Synthetic Google Scholar pages
+Renders author search, publication list and paper detail pages with the same
+markup parser.py reads from the real site, for benchmarks and local testing.
+"""
+
+import random
+from html import escape
+
+FIRST_NAMES = ['Ada', 'Alan', 'Grace', 'Edsger', 'Barbara', 'Donald', 'Frances', 'Niklaus', 'Radia', 'Tony']
+LAST_NAMES = ['Lovelace', 'Turing', 'Hopper', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'Wirth', 'Perlman', 'Hoare']
+VENUES = ['Physical Review Letters', 'Nature', 'Communications of the ACM', 'Journal of Algorithms',
+          'Proceedings of the Royal Society A', 'arXiv preprint', 'Annals of Mathematics']
+PUBLISHERS = ['Elsevier', 'Springer', 'ACM', 'IEEE', 'Nature Publishing Group', 'Cambridge University Press']
+WORDS = ['quantum', 'black', 'hole', 'entropy', 'radiation', 'cosmology', 'inflation', 'lattice', 'graph',
+         'algorithm', 'complexity', 'boundary', 'horizon', 'gravity', 'spacetime', 'theory', 'model', 'field']
+
+# Real Scholar pages carry tens of kilobytes of inline CSS, scripts and
+# navigation around the content parser.py reads; mimic that bulk
+PAGE_STYLE = ''.join(f'.gs_x{i}{{margin:{i % 9}px;color:#{i * 2654435761 % 0xffffff:06x}}}' for i in range(900))
+PAGE_SCRIPT = 'var gs_js={' + ','.join(f'"k{i}":"{i * 40503 % 99991:x}"' for i in range(1500)) + '};'
+PAGE_NAV = ''.join(f'<div class="gs_md_li"><a href="/scholar_settings?item={i}" class="gs_btnX">Menu item {i}</a></div>'
+                   for i in range(120))
+PAGE_HEAD = ('<!doctype html><html><head><meta charset="utf-8"><title>Google Scholar</title>'
+             f'<style>{PAGE_STYLE}</style><script>{PAGE_SCRIPT}</script></head><body>'
+             f'<div id="gs_top"><div id="gs_hdr_drw">{PAGE_NAV}</div></div>')
+PAGE_TAIL = f'<div id="gs_ftr">{PAGE_NAV}</div><!-- rendered by scholar_fixtures --></body></html>'
+
+
+def synthetic_papers(user_id, count, seed=0, newest_year=2025):
+    """Build count deterministic paper records for a synthetic author, newest first"""
+    rng = random.Random(f"{user_id}:{seed}")
+    papers = []
+    year = newest_year
+    for index in range(count):
+        # Roughly eight papers a year, walking backwards in time like sortby=pubdate
+        if index and rng.random() < 0.12:
+            year -= 1
+        authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(1, 6))]
+        histogram_years = list(range(max(year, newest_year - 12), newest_year + 1))
+        papers.append({
+            'citation_id': f"{user_id}:P{index:05d}",
+            'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))).capitalize(),
+            'authors': authors,
+            'venue': rng.choice(VENUES),
+            'publisher': rng.choice(PUBLISHERS),
+            'year': year,
+            'month': rng.randint(1, 12),
+            'day': rng.randint(1, 28),
+            'volume': rng.randint(1, 120),
+            'pages': f"{rng.randint(1, 900)}-{rng.randint(901, 2000)}",
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 160))).capitalize() + '.',
+            'histogram': {y: rng.choice([0, rng.randint(1, 400)]) for y in histogram_years},
+        })
+    for paper in papers:
+        paper['citations'] = sum(paper['histogram'].values())
+    return papers
+
+
+def short_authors(authors):
+    """Abbreviate author names the way the list page does ("A Lovelace, A Turing")"""
+    return ', '.join(f"{name.split()[0][0]} {name.split()[-1]}" for name in authors)
+
+
+def render_search_page(query, profiles, base_url=''):
+    """Render a /scholar search page with a "User profiles for" block"""
+    cells = ''.join(
+        f'<td valign="top"><h4 class="gs_rt2"><a href="{base_url}/citations?user={escape(profile["user_id"])}&amp;hl=en&amp;oi=ao">'
+        f'<b>{escape(profile["name"])}</b></a></h4>'
+        f'<div>{escape(profile.get("affiliation", ""))}</div><div>Verified email at example.edu</div>'
+        f'<div>Cited by {profile.get("cited_by", 0)}</div></td>'
+        for profile in profiles
+    )
+    return (PAGE_HEAD
+            + f'<div id="gs_res_ccl_mid"><h3 class="gs_rt"><a href="#">User profiles for <b>{escape(query)}</b></a></h3>'
+            + f'<table><tr>{cells}</tr></table></div>'
+            + '<div class="gs_r gs_or gs_scl"><h3 class="gs_rt"><a href="#">Some unrelated article</a></h3></div>'
+            + PAGE_TAIL)
+
+
+def render_list_row(paper, user_id):
+    """Render one tr.gsc_a_tr row of the publications list"""
+    citations = (f'<a href="/scholar?oi=bibs&amp;cites={paper["citation_id"]}" class="gsc_a_ac gs_ibl">{paper["citations"]}</a>'
+                 if paper['citations'] else '<a class="gsc_a_ac gs_ibl"></a>')
+    return (f'<tr class="gsc_a_tr"><td class="gsc_a_t">'
+            f'<a href="/citations?view_op=view_citation&amp;hl=en&amp;user={user_id}&amp;pagesize=100&amp;sortby=pubdate'
+            f'&amp;citation_for_view={paper["citation_id"]}" class="gsc_a_at">{escape(paper["title"])}</a>'
+            f'<div class="gs_gray">{escape(short_authors(paper["authors"]))}</div>'
+            f'<div class="gs_gray">{escape(paper["venue"])} {paper["volume"]}, {paper["pages"]}<span class="gs_oph">, {paper["year"]}</span></div></td>'
+            f'<td class="gsc_a_c">{citations}</td>'
+            f'<td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">{paper["year"]}</span></td></tr>')
+
+
+def render_list_page(papers, user_id):
+    """Render a view_op=list_works page containing the given papers"""
+    rows = ''.join(render_list_row(paper, user_id) for paper in papers)
+    return (PAGE_HEAD
+            + '<div id="gsc_prf_in">Synthetic Author</div>'
+            + '<table id="gsc_a_t"><thead><tr><th>Title</th><th>Cited by</th><th>Year</th></tr></thead>'
+            + f'<tbody id="gsc_a_b">{rows}</tbody></table>'
+            + PAGE_TAIL)
+
+
+def render_histogram(histogram, citation_id=''):
+    """Render the per-year citation bar chart; years without citations have no bar"""
+    years = sorted(histogram)
+    labels = ''.join(f'<span class="gsc_oci_g_t" style="left:{32 * i + 11}px">{year}</span>'
+                     for i, year in enumerate(years))
+    bars = ''.join(
+        f'<a href="/scholar?oi=bibs&amp;hl=en&amp;cites={citation_id}&amp;as_sdt=5&amp;as_ylo={year}&amp;as_yhi={year}" '
+        f'class="gsc_oci_g_a" style="left:{32 * i + 18}px;height:{min(count, 80)}px;z-index:{len(years) - i}">'
+        f'<span class="gsc_oci_g_al">{count}</span></a>'
+        for i, (year, count) in enumerate((year, histogram[year]) for year in years) if count
+    )
+    return f'<div id="gsc_oci_graph"><div id="gsc_oci_graph_bars" style="width:{32 * len(years) + 20}px">{labels}{bars}</div></div>'
+
+
+def render_detail_page(paper, user_id):
+    """Render a view_op=view_citation page for one paper"""
+    def field(name, value_html):
+        return f'<div class="gs_scl"><div class="gsc_oci_field">{name}</div><div class="gsc_oci_value">{value_html}</div></div>'
+
+    fields = [
+        field('Authors', escape(', '.join(paper['authors']))),
+        field('Publication date', f"{paper['year']}/{paper['month']}/{paper['day']}"),
+        field('Journal', escape(paper['venue'])),
+        field('Volume', str(paper['volume'])),
+        field('Pages', paper['pages']),
+        field('Publisher', escape(paper['publisher'])),
+        '<div class="gs_scl"><div class="gsc_oci_field">Description</div><div class="gsc_oci_value" id="gsc_oci_descr">'
+        f'<div class="gsh_small"><div class="gsh_csp">{escape(paper["abstract"])}</div></div></div></div>',
+        field('Total citations', f'<div style="margin-bottom:1em"><a href="/scholar?cites={paper["citation_id"]}">Cited by {paper["citations"]}</a></div>'
+                                 + render_histogram(paper['histogram'], paper['citation_id'])),
+        field('Scholar articles', f'<div class="gsc_oci_merged_snippet"><div><a href="/scholar?cluster=1">{escape(paper["title"])}</a></div>'
+                                  f'<div>{escape(short_authors(paper["authors"]))}&nbsp;- {escape(paper["venue"])}, {paper["year"]}</div></div>'),
+    ]
+    return (PAGE_HEAD
+            + f'<div id="gsc_oci_title_wrapper"><div id="gsc_oci_title"><a class="gsc_oci_title_link" href="#">{escape(paper["title"])}</a></div></div>'
+            + f'<div id="gsc_oci_table">{"".join(fields)}</div>'
+            + PAGE_TAIL)
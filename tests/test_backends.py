@@ -0,0 +1,37 @@
+"""Parser backends on a corpus recorded with --record from mock_scholar.py"""
+
+import unittest
+from pathlib import Path
+
+from benchmark_parsers import load_corpus, parse_corpus
+from parser import LxmlBackend, SoupBackend, lxml_html
+
+CORPUS_DIR = Path(__file__).parent / 'fixtures' / 'scholar_pages'
+
+
+class BackendAgreementTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = load_corpus(CORPUS_DIR)
+        # A full BeautifulSoup parse is the reference every other backend must match
+        cls.reference = parse_corpus(SoupBackend(targeted=False), cls.corpus)
+    
+    def test_corpus_has_every_page_kind(self):
+        self.assertTrue(self.reference['search'][0])
+        self.assertEqual(len(self.reference['list'][0]), 100)
+        self.assertEqual(len(self.reference['detail']), 6)
+        for details in self.reference['detail']:
+            self.assertIn('citation_years', details)
+    
+    def test_targeted_soup_matches_full(self):
+        self.assertEqual(parse_corpus(SoupBackend(targeted=True), self.corpus), self.reference)
+    
+    @unittest.skipIf(lxml_html is None, "lxml is not installed")
+    def test_lxml_matches_soup(self):
+        for targeted in (False, True):
+            with self.subTest(targeted=targeted):
+                self.assertEqual(parse_corpus(LxmlBackend(targeted=targeted), self.corpus), self.reference)
+
+
+if __name__ == '__main__':
+    unittest.main()
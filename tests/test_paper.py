@@ -0,0 +1,31 @@
+"""Paper records against the example output in hawking_papers.json"""
+
+import json
+import unittest
+from pathlib import Path
+
+from parser import Paper, json_default
+
+EXAMPLE_OUTPUT = Path(__file__).parent.parent / 'hawking_papers.json'
+
+
+class PaperRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        with open(EXAMPLE_OUTPUT) as f:
+            self.records = json.load(f)
+    
+    def test_records_round_trip(self):
+        for record in self.records:
+            paper = Paper.from_dict(record)
+            self.assertEqual(paper.to_dict(), record)
+            self.assertEqual(dict(paper), record)
+            self.assertEqual(list(paper), list(record))
+            self.assertEqual(len(paper), len(record))
+    
+    def test_json_output_unchanged(self):
+        papers = [Paper.from_dict(record) for record in self.records]
+        self.assertEqual(json.dumps(papers, indent=2, default=json_default), json.dumps(self.records, indent=2))
+
+
+if __name__ == '__main__':
+    unittest.main()